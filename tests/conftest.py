@@ -0,0 +1,5 @@
+import sys
+from os.path import abspath, dirname
+
+# The solver modules live at the top of the repository
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
@@ -0,0 +1,68 @@
+import functools
+import numpy as np
+import pytest
+import random
+from wordle_brute_force import MinimaxSearch
+from wordle_feedback import SOLVED_CODE
+from wordle_heuristic import get_feedback_string, solution_words
+from wordle_session import SolverSession
+
+@pytest.fixture(scope="module")
+def search():
+    return MinimaxSearch(solution_words)
+
+"""
+Small candidate sets: random words, and the candidates left in random games,
+which share a lot more letters and so need deeper searches
+"""
+def random_candidates(count, seed):
+    rng = random.Random(seed)
+    states = []
+    while len(states) < count:
+        if len(states) % 2 == 0:
+            states.append(sorted(rng.sample(range(len(solution_words)), rng.randint(3, 10))))
+            continue
+
+        solution = rng.choice(solution_words)
+        guesses = rng.sample(solution_words, 2)
+        if solution in guesses:
+            continue
+        session = SolverSession(solution_words, guesses, [get_feedback_string(guess, solution) for guess in guesses], use_book=False)
+        if 3 <= len(session.candidate_ids) <= 14:
+            states.append(session.candidate_ids.tolist())
+    return states
+
+"""
+Worst case number of guesses over every strategy that only guesses candidates,
+found by trying all of them
+"""
+def naive_depth(matrix, candidate_ids):
+    @functools.lru_cache(maxsize=None)
+    def depth(ids):
+        if len(ids) <= 1:
+            return len(ids)
+        return min(worst_case(ids, guess_id) for guess_id in ids)
+
+    @functools.lru_cache(maxsize=None)
+    def worst_case(ids, guess_id):
+        array = np.array(ids, dtype=np.int64)
+        codes = matrix.lookup(np.array([guess_id], dtype=np.int64), array)[0]
+        worst = 1
+        for code in np.unique(codes).tolist():
+            if code != SOLVED_CODE:
+                worst = max(worst, 1 + depth(tuple(array[codes == code].tolist())))
+        return worst
+
+    return depth(tuple(candidate_ids)), worst_case
+
+"""
+One search is shared by every state, so its transposition table is full of
+entries from earlier searches, including lower bounds from cut-off ones
+"""
+@pytest.mark.parametrize("candidate_ids", random_candidates(40, 0))
+def test_minimax_matches_naive(search, candidate_ids):
+    expected, worst_case = naive_depth(search.matrix, candidate_ids)
+    depth, guess = search.solve(candidate_ids)
+
+    assert depth == expected
+    assert worst_case(tuple(candidate_ids), search.matrix.index[guess]) == expected
@@ -0,0 +1,96 @@
+import random
+import pytest
+import sys
+import wordle_book
+from wordle_heuristic import LATE_GAME_CANDIDATES, all_words, best_next_guess_max_info, best_next_guess_std_dev, dict_std_dev, find_n_smallest, get_feedback_string, possible_feedbacks, possible_next_guesses, solution_words
+
+"""
+Random game states: a solution and one to three guesses that don't solve it,
+all drawn from words
+"""
+def random_states(words, count, seed, max_candidates=None):
+    rng = random.Random(seed)
+    states = []
+    while len(states) < count:
+        solution = rng.choice(words)
+        guesses = rng.sample(words, rng.randint(1, 3))
+        if solution in guesses:
+            continue
+
+        feedbacks = [get_feedback_string(guess, solution) for guess in guesses]
+        if max_candidates is not None:
+            num_candidates = len(possible_next_guesses(guesses, feedbacks, words, use_index=False))
+            if num_candidates < 2 or num_candidates > max_candidates:
+                continue
+
+        states.append((guesses, feedbacks))
+    return states
+
+"""
+The original std dev heuristic, one feedback string at a time over dicts
+"""
+def reference_std_dev(guesses, feedbacks, word_list):
+    feedback_strings = possible_feedbacks(feedbacks[-1])
+    possible_words = possible_next_guesses(guesses, feedbacks, word_list, use_index=False)
+    std_devs = {}
+    for guess in possible_words:
+        counts = {feedback: 0 for feedback in feedback_strings}
+        for solution in possible_words:
+            if guess != solution:
+                counts[get_feedback_string(guess, solution)] += 1
+        std_devs[guess] = dict_std_dev(counts)
+
+    smallest = find_n_smallest(std_devs)
+    return smallest[list(smallest.keys())[0]][0]
+
+"""
+The original max info heuristic, except that it falls back to the std dev
+heuristic over word_list rather than all_words
+"""
+def reference_max_info(guesses, feedbacks, word_list):
+    if feedbacks[-1].count('3') == 0:
+        return reference_std_dev(guesses, feedbacks, word_list)
+
+    possible_words = possible_next_guesses(guesses, feedbacks, word_list, use_index=False)
+    best = ""
+    min_unmatching = float('inf')
+    for guess in possible_words:
+        count = sum(get_feedback_string(guess, solution).count('3') for solution in possible_words if solution != guess)
+        if count < min_unmatching:
+            min_unmatching = count
+            best = guess
+    return best
+
+@pytest.fixture
+def no_book(monkeypatch):
+    monkeypatch.setattr(wordle_book, "opening_book_guess", lambda *args: None)
+
+"""
+Intersecting the index masks finds exactly the words _is_possible_next_guess
+accepts, in the same order. all_words has plenty of repeated letters
+"""
+@pytest.mark.parametrize("guesses, feedbacks", random_states(all_words, 20, 0))
+def test_index_matches_scan(guesses, feedbacks):
+    assert possible_next_guesses(guesses, feedbacks, all_words) == possible_next_guesses(guesses, feedbacks, all_words, use_index=False)
+
+@pytest.mark.parametrize("guesses, feedbacks", random_states(solution_words, 20, 1, max_candidates=150))
+def test_best_next_guess_std_dev_matches_reference(no_book, guesses, feedbacks):
+    assert best_next_guess_std_dev(guesses, feedbacks, solution_words) == reference_std_dev(guesses, feedbacks, solution_words)
+
+@pytest.mark.parametrize("guesses, feedbacks", random_states(solution_words, 20, 2, max_candidates=150))
+def test_best_next_guess_max_info_matches_reference(no_book, guesses, feedbacks):
+    assert best_next_guess_max_info(guesses, feedbacks, solution_words) == reference_max_info(guesses, feedbacks, solution_words)
+
+"""
+Without numpy loaded, states with few candidates are scored in plain Python.
+numpy is only hidden, and none of these states has enough candidates to need it
+"""
+@pytest.mark.parametrize("guesses, feedbacks", random_states(solution_words, 20, 3, max_candidates=LATE_GAME_CANDIDATES))
+def test_late_game_matches_reference(no_book, monkeypatch, guesses, feedbacks):
+    std_dev = reference_std_dev(guesses, feedbacks, solution_words)
+    max_info = reference_max_info(guesses, feedbacks, solution_words)
+
+    monkeypatch.delitem(sys.modules, "numpy")
+    assert best_next_guess_std_dev(guesses, feedbacks, solution_words) == std_dev
+    assert best_next_guess_max_info(guesses, feedbacks, solution_words) == max_info
+    assert "numpy" not in sys.modules
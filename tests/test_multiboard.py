@@ -0,0 +1,19 @@
+import numpy as np
+from wordle_heuristic import get_feedback_string, solution_words
+from wordle_multiboard import MultiBoardSession
+from wordle_scoring import bucket_codes_after, score_guesses
+from wordle_session import SolverSession
+
+"""
+Two boards whose greens differ: after "raise", "rebut" has a green r and
+"cigar" has none. The guesses come from both boards, and most of them break
+rebut's green, which must still count against them on that board
+"""
+def test_scores_count_every_board():
+    boards = [SolverSession(solution_words, ["raise"], [get_feedback_string("raise", solution)], use_book=False) for solution in ["cigar", "rebut"]]
+    game = MultiBoardSession(boards)
+    guess_ids, scores = game.scores()
+
+    per_board = [score_guesses(game.matrix, guess_ids, board.candidate_ids, bucket_codes_after()).std_devs for board in boards]
+    assert (per_board[1] > 0).all()
+    np.testing.assert_array_equal(scores.std_devs, per_board[0] + per_board[1])
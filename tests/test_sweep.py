@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+import wordle_sweep
+from wordle_cache import ArtifactCache
+from wordle_feedback import NUM_FEEDBACKS, get_feedback_matrix
+from wordle_heuristic import find_n_smallest, solution_words
+from wordle_scoring import bucket_counts
+from wordle_store import ScoreStore
+
+WORDS = solution_words[:500]
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = ArtifactCache(str(tmp_path / "cache"))
+    monkeypatch.setattr(wordle_sweep, "default_cache", cache)
+    return cache
+
+"""
+Many workers on small shards keep checking each other's shards while they are
+being written, which must not disturb them
+"""
+@pytest.mark.parametrize("run", range(10))
+def test_local_sweep_merges(tmp_path, cache, run):
+    sweep_dir = str(tmp_path / "sweep")
+    results = wordle_sweep.run_local(WORDS, "max_info", 4, sweep_dir, 16, num_results=5)
+
+    ids = np.arange(len(WORDS))
+    counts = bucket_counts(get_feedback_matrix(WORDS), ids, ids)[:, NUM_FEEDBACKS - 1]
+    assert results == find_n_smallest({word: int(count) for word, count in zip(WORDS, counts.tolist())}, 5)
+
+"""
+A worker whose claim is taken over part way through a shard (say it stalled
+past stale_after) keeps what it wrote before, but stops writing and leaves the
+new owner's lock alone
+"""
+def test_worker_drops_shard_when_claim_is_taken(tmp_path, cache, monkeypatch):
+    sweep_dir = str(tmp_path / "sweep")
+    batches = []
+
+    def score_and_steal(matrix, guess_ids, solution_ids):
+        batches.append(guess_ids)
+        if len(batches) == 2:
+            with open(wordle_sweep._lock_file(sweep_dir, 0), "w") as file:
+                file.write("thief")
+        return wordle_sweep._score_max_info(matrix, guess_ids, solution_ids)
+
+    monkeypatch.setitem(wordle_sweep.SWEEPS, "max_info", score_and_steal)
+    assert wordle_sweep.run_worker(WORDS[:64], "max_info", sweep_dir, 64, batch_size=16) == 0
+
+    with open(wordle_sweep._lock_file(sweep_dir, 0)) as file:
+        assert file.read() == "thief"
+    store = ScoreStore(wordle_sweep._store_file(sweep_dir, 0), 64, repair=False)
+    assert not store.complete
+    assert sorted(store.scores) == list(range(16))
@@ -0,0 +1,122 @@
+import numpy as np
+import time
+from typing import List, NamedTuple
+from wordle_heuristic import all_words
+from wordle_scoring import bucket_counts, bucket_codes_after, score_guesses
+from wordle_session import SolverSession
+
+# Number of guess/candidate pairs scored between deadline checks
+PAIRS_PER_STEP = 1 << 16
+
+"""
+Result of an anytime search
+ - guess: best guess found within the budget
+ - scored: number of guesses scored with the std dev heuristic
+ - total: number of guesses there were to score
+ - finished: whether every guess was scored, in which case guess is the same
+   as best_next_guess_std_dev's
+ - depth: 2 if guess was picked by two-step lookahead, 1 otherwise
+"""
+class AnytimeResult(NamedTuple):
+    guess: str
+    scored: int
+    total: int
+    finished: bool
+    depth: int
+
+"""
+Order the candidates so the most promising guesses are scored first: the ones
+whose letters appear in the most remaining candidates
+"""
+def coverage_order(session: SolverSession) -> np.ndarray:
+    masks = session.matrix.masks[session.candidate_ids]
+    letters = ((masks[:, None] >> np.arange(26, dtype=np.uint32)) & 1).astype(np.int64)
+    coverage = letters @ letters.sum(axis=0)
+    return np.argsort(-coverage, kind="stable")
+
+"""
+Two-step lookahead score for a guess: the sum over its buckets of the squared
+bucket sizes left after the best second guess within that bucket. Proportional
+to the expected number of candidates left after two guesses, lower is better.
+Returns None if the deadline passed first
+"""
+def _lookahead_score(session: SolverSession, guess_id: int, deadline: float) -> int:
+    candidate_ids = session.candidate_ids
+    codes = session.matrix.row(guess_id, candidate_ids)
+    total = 0
+    for code in np.unique(codes).tolist():
+        bucket = candidate_ids[(codes == code) & (candidate_ids != guess_id)]
+        if len(bucket) <= 1:
+            total = total + len(bucket)
+            continue
+
+        if time.perf_counter() > deadline:
+            return None
+
+        counts = bucket_counts(session.matrix, bucket, bucket)
+        total = total + int((counts * counts).sum(axis=1).min())
+
+    return total
+
+"""
+Pick the next guess for a session within a time budget (in seconds). Guesses
+are scored in coverage order in small batches until the budget runs out, and
+the best one found so far is returned. If every guess is scored in time and
+lookahead is set, the remaining budget goes to a two-step lookahead over the
+best guesses, in std dev order
+"""
+def anytime_next_guess(session: SolverSession, budget: float = 0.05, lookahead: bool = False, start: float = None) -> AnytimeResult:
+    start = time.perf_counter() if start is None else start
+    deadline = start + budget
+    candidate_ids = session.candidate_ids
+    total = len(candidate_ids)
+    if total == 0:
+        return AnytimeResult("", 0, 0, True, 1)
+
+    order = coverage_order(session)
+    bucket_codes = bucket_codes_after(session.last_feedback())
+    std_devs = np.full(total, np.inf)
+    batch_size = max(1, PAIRS_PER_STEP // total)
+
+    scored = 0
+    while scored < total:
+        # Always score at least one batch so there is something to return
+        if scored > 0 and time.perf_counter() > deadline:
+            break
+
+        batch = order[scored:scored + batch_size]
+        std_devs[batch] = score_guesses(session.matrix, candidate_ids[batch], candidate_ids, bucket_codes).std_devs
+        scored = scored + len(batch)
+
+    # Unscored guesses are inf, and argmin breaks ties on the word list order
+    # like best_next_guess_std_dev does
+    best = int(np.argmin(std_devs))
+    finished = scored == total
+    if not (finished and lookahead and total > 2):
+        return AnytimeResult(session.word_list[int(candidate_ids[best])], scored, total, finished, 1)
+
+    best_lookahead = None
+    for i in np.argsort(std_devs, kind="stable").tolist():
+        score = _lookahead_score(session, int(candidate_ids[i]), deadline)
+        if score is None:
+            break
+        if best_lookahead is None or score < best_lookahead:
+            best_lookahead = score
+            best = i
+
+    depth = 1 if best_lookahead is None else 2
+    return AnytimeResult(session.word_list[int(candidate_ids[best])], scored, total, finished, depth)
+
+"""
+Anytime version of best_next_guess_std_dev for the given game state. The budget
+includes narrowing down the candidates
+"""
+def best_next_guess_anytime(curr_guesses: List[str], curr_feedbacks: List[str], word_list: List[str] = all_words, budget: float = 0.05, lookahead: bool = False) -> AnytimeResult:
+    start = time.perf_counter()
+    session = SolverSession(word_list, curr_guesses, curr_feedbacks)
+    return anytime_next_guess(session, budget, lookahead, start)
+
+if __name__ == '__main__':
+    print(best_next_guess_anytime(["irate"], ["32332"]))
+    print(best_next_guess_anytime(["lares"], ["33333"]))
+    print(best_next_guess_anytime(["irate", "sored"], ["32332", "31113"], lookahead=True))
@@ -0,0 +1,284 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from os.path import exists, join
+from typing import Callable, Dict, List, Tuple
+import numpy as np
+import wordle_brute_force
+import wordle_heuristic
+import wordle_multiboard
+import wordle_session
+from wordle_cache import default_cache
+from wordle_feedback import build_feedback_matrix
+from wordle_heuristic import all_words, solution_words
+from wordle_words import PACKAGE_DIR
+
+DEFAULT_BASELINE_FILE = join(PACKAGE_DIR, "bench_baselines.json")
+# Key of the calibration run in the baseline file
+CALIBRATION = "calibration"
+# Milliseconds a fresh process may take to import the solver and suggest one
+# late game guess, not counting starting Python itself
+STARTUP_BUDGET_MS = 100
+
+# Fixed word list subsets so results are comparable between runs
+SUBSET = all_words[::2]
+PAIRS = [(all_words[i], solution_words[(i * 7) % len(solution_words)]) for i in range(0, len(all_words), 13)]
+
+# Game states at different points of a game with solution 'cigar'
+def _state(guesses: List[str]) -> Tuple[List[str], List[str]]:
+    return guesses, [wordle_heuristic.get_feedback_string(guess, "cigar") for guess in guesses]
+
+EARLY = _state(["tonus"])
+MID = _state(["tonus", "whelk"])
+LATE = _state(["tonus", "whelk", "miked"])
+
+# States a one-off call must answer within the startup budget: late in a game,
+# and after two guesses (which may be answered from the opening book) that
+# already leave few candidates
+STARTUP_STATES = [LATE, (["crane", "moist"], [wordle_heuristic.get_feedback_string(guess, "pious") for guess in ["crane", "moist"]])]
+
+BENCHMARKS: Dict[str, Callable[[], Tuple[Callable[[], None], int]]] = {}
+
+"""
+Register a benchmark. The decorated function sets up whatever it needs and
+returns the work to time along with how many operations one call of it is
+"""
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+@benchmark("get_feedback_string")
+def _feedback_string():
+    def run():
+        for guess, solution in PAIRS:
+            wordle_heuristic.get_feedback_string(guess, solution)
+    return run, len(PAIRS)
+
+@benchmark("possible_next_guesses")
+def _possible_next_guesses():
+    def run():
+        for guesses, feedbacks in (EARLY, MID, LATE):
+            wordle_heuristic.possible_next_guesses(guesses, feedbacks, SUBSET)
+    return run, 3
+
+@benchmark("dict_std_dev")
+def _dict_std_dev():
+    counts = {feedback: i % 17 for i, feedback in enumerate(wordle_heuristic.feedbacks)}
+    def run():
+        for _ in range(100):
+            wordle_heuristic.dict_std_dev(counts)
+    return run, 100
+
+def _next_guess(name: str, state: Tuple[List[str], List[str]]):
+    def setup():
+        next_guess = getattr(wordle_heuristic, name)
+        return (lambda: next_guess(state[0], state[1], SUBSET)), 1
+    return setup
+
+for _name in ("best_next_guess_std_dev", "best_next_guess_max_info"):
+    for _phase, _game in (("early", EARLY), ("mid", MID), ("late", LATE)):
+        benchmark(_name + "_" + _phase)(_next_guess(_name, _game))
+
+@benchmark("multi_board_std_dev_4")
+def _multi_board():
+    solutions = ["cigar", "rebut", "sissy", "humph"]
+    session = wordle_session.SolverSession(SUBSET)
+    boards = []
+    for solution in solutions:
+        board = session.fork()
+        board.apply("tonus", wordle_heuristic.get_feedback_string("tonus", solution))
+        boards.append(board)
+    game = wordle_multiboard.MultiBoardSession(boards)
+    return game.best_next_guess_std_dev, 1
+
+@benchmark("tester_std_dev_solutions")
+def _tester():
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            wordle_heuristic.tester_std_dev(["raise"], solution_words, join(tempfile.gettempdir(), "bench_length_counts.json"))
+    return run, len(solution_words)
+
+@benchmark("longest_path_to_every_word")
+def _longest_path():
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            wordle_brute_force.longest_path_to_every_word(["rates"], ["11131"])
+    return run, 1
+
+@benchmark("minimax_rates")
+def _minimax():
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            wordle_brute_force.optimal_worst_case_depth(["rates"], ["11331"])
+    return run, 1
+
+"""
+Fixed Python and numpy work that doesn't touch the solver. Its speed tells how
+fast this machine is compared to the one the baselines were recorded on
+"""
+def _calibration():
+    values = [(i * 7919) % 10007 for i in range(20000)]
+    array = np.array(values * 10)
+    def run():
+        sorted(values)
+        sum(value * value for value in values)
+        np.sort(array)
+        np.bincount(array)
+    return run, 1
+
+"""
+Point the artifact cache at a temporary directory holding nothing but a freshly
+built feedback matrix for all_words, so results don't depend on which matrices,
+opening books and score stores happen to be in .wordle_cache
+"""
+@contextlib.contextmanager
+def pinned_cache():
+    saved = default_cache.cache_dir
+    with tempfile.TemporaryDirectory() as cache_dir:
+        default_cache.cache_dir = cache_dir
+        try:
+            with contextlib.redirect_stderr(io.StringIO()):
+                build_feedback_matrix(all_words)
+            yield
+        finally:
+            default_cache.cache_dir = saved
+
+STARTUP_CODE = """
+import time
+start = time.perf_counter()
+import wordle_heuristic
+wordle_heuristic.best_next_guess_std_dev(%r, %r)
+print((time.perf_counter() - start) * 1000)
+"""
+
+"""
+Time what a one-off command line call pays: importing wordle_heuristic and
+one suggestion for each of STARTUP_STATES in a fresh process, run from another
+directory. Best of several runs for the slowest state, in milliseconds
+"""
+def measure_startup(runs: int = 5) -> float:
+    env = dict(os.environ, PYTHONPATH=PACKAGE_DIR)
+    slowest = 0.0
+    for state in STARTUP_STATES:
+        times = []
+        for _ in range(runs):
+            output = subprocess.run([sys.executable, "-c", STARTUP_CODE % state], capture_output=True, text=True, check=True, cwd=tempfile.gettempdir(), env=env).stdout
+            times.append(float(output))
+        slowest = max(slowest, min(times))
+    return slowest
+
+"""
+Time a benchmark and measure its peak memory. The work is run once to warm up
+caches, then timed repeatedly for at least min_time seconds, keeping the best
+run. Peak memory comes from one more run under tracemalloc
+"""
+def measure(setup: Callable[[], Tuple[Callable[[], None], int]], min_time: float = 1.0) -> dict:
+    run, ops = setup()
+    run()
+
+    best = float('inf')
+    total = 0.0
+    while total < min_time:
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total = total + elapsed
+
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"ops_per_second": ops / best, "peak_bytes": peak}
+
+"""
+How fast this machine is relative to the one the baselines were recorded on,
+going by the calibration runs
+"""
+def machine_speed(results: dict, baselines: dict) -> float:
+    return results[CALIBRATION]["ops_per_second"] / baselines[CALIBRATION]["ops_per_second"]
+
+"""
+Compare results against the baselines. Baseline throughputs are scaled by how
+much faster or slower the calibration run is than when they were recorded. A
+benchmark regresses if its throughput drops, or its peak memory grows, by more
+than threshold (a fraction). Benchmarks without a baseline fail too
+"""
+def regressions(results: dict, baselines: dict, threshold: float) -> List[str]:
+    failures = []
+    speed = machine_speed(results, baselines)
+    for name, result in results.items():
+        if name == CALIBRATION:
+            continue
+        if name not in baselines:
+            failures.append(name + ": no baseline")
+            continue
+
+        baseline = baselines[name]
+        expected = baseline["ops_per_second"] * speed
+        if result["ops_per_second"] < expected * (1 - threshold):
+            failures.append(name + ": " + str(round(result["ops_per_second"], 1)) + " ops/s, baseline " + str(round(expected, 1)) + " on this machine")
+        if result["peak_bytes"] > baseline["peak_bytes"] * (1 + threshold):
+            failures.append(name + ": " + str(result["peak_bytes"]) + " peak bytes, baseline " + str(baseline["peak_bytes"]))
+
+    return failures
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the solver hot paths against recorded baselines")
+    parser.add_argument("benchmarks", nargs="*", default=list(BENCHMARKS), help="benchmarks to run (default: all)")
+    parser.add_argument("--record", action="store_true", help="save the results as the new baselines")
+    parser.add_argument("--baseline-file", default=DEFAULT_BASELINE_FILE)
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed regression as a fraction (default 0.25)")
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds to spend timing each benchmark")
+    parser.add_argument("--startup-budget", type=float, default=STARTUP_BUDGET_MS, help="milliseconds allowed for import plus one late game guess")
+    args = parser.parse_args()
+
+    baselines = {}
+    if exists(args.baseline_file):
+        with open(args.baseline_file) as file:
+            baselines = json.load(file)
+    if not args.record and CALIBRATION not in baselines:
+        print("No calibrated baselines in " + args.baseline_file + ", record them with --record")
+        sys.exit(1)
+
+    results = {CALIBRATION: measure(_calibration, args.min_time)}
+    speed = machine_speed(results, baselines) if CALIBRATION in baselines else 1.0
+    print("calibration: " + str(round(speed, 2)) + "x the speed of the baseline machine")
+    with pinned_cache():
+        for name in args.benchmarks:
+            results[name] = measure(BENCHMARKS[name], args.min_time)
+            line = name + ": " + str(round(results[name]["ops_per_second"], 1)) + " ops/s, " + str(round(results[name]["peak_bytes"] / 1024 ** 2, 2)) + " MB peak"
+            if name in baselines:
+                line = line + " (baseline " + str(round(baselines[name]["ops_per_second"] * speed, 1)) + " ops/s)"
+            print(line)
+
+    if args.record:
+        # Baselines that weren't rerun are rescaled to the new calibration
+        for name in baselines:
+            if name not in results:
+                baselines[name]["ops_per_second"] = baselines[name]["ops_per_second"] * speed
+        baselines.update(results)
+        with open(args.baseline_file, "w") as outfile:
+            json.dump(baselines, outfile, indent=4, sort_keys=True)
+        print("Recorded baselines in " + args.baseline_file)
+        sys.exit(0)
+
+    failures = regressions(results, baselines, args.threshold)
+    startup = measure_startup()
+    print("startup: " + str(round(startup, 1)) + " ms (budget " + str(args.startup_budget) + " ms)")
+    if startup > args.startup_budget:
+        failures.append("startup: " + str(round(startup, 1)) + " ms, budget " + str(args.startup_budget) + " ms")
+
+    for failure in failures:
+        print("REGRESSION " + failure)
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,136 @@
+import json
+import numpy as np
+import sys
+from os.path import exists, splitext
+from tqdm import tqdm
+from typing import Dict, List
+from wordle_cache import default_cache, replace_with_sidecar, temp_path
+from wordle_feedback import FEEDBACK_STRINGS, NUM_FEEDBACKS, SOLVED_CODE, encode_feedback, get_feedback_matrix
+from wordle_session import STRATEGIES, SolverSession
+from wordle_words import get_all_words, get_solution_words
+
+MERGED_STARTING_WORDS = ["lares","rales","tares","soare","reais","stoae","toeas","aloes","aeons","aeros", "adieu","raise","arise","irate","arose","alter","alone","audio","atone"]
+
+"""
+Precomputed second and third guesses of a strategy for a set of starting
+words. table[s, f1, 0] is the word id of the second guess after starting word s
+got feedback code f1, and table[s, f1, 1 + f2] the third guess after that
+second guess got feedback code f2. Missing entries (empty buckets, or third
+guesses that weren't built) are -1
+"""
+class OpeningBook:
+    def __init__(self, word_list: List[str], starting_words: List[str], table: np.ndarray):
+        self.word_list = word_list
+        self.starts = {word: i for i, word in enumerate(starting_words)}
+        self.table = table
+
+    """
+    The book's next guess for a game in its first two moves, or None if the
+    game isn't covered
+    """
+    def lookup(self, guesses: List[str], feedbacks: List[str]) -> str:
+        if not 1 <= len(guesses) <= 2 or guesses[0] not in self.starts:
+            return None
+
+        row = self.table[self.starts[guesses[0]], encode_feedback(feedbacks[0])]
+        second = int(row[0])
+        if len(guesses) == 1:
+            return self.word_list[second] if second >= 0 else None
+
+        if second < 0 or self.word_list[second] != guesses[1]:
+            return None
+
+        third = int(row[1 + encode_feedback(feedbacks[1])])
+        return self.word_list[third] if third >= 0 else None
+
+def _book_file(word_list: List[str], strategy: str) -> str:
+    return default_cache.path(word_list, "opening_book", {"strategy": strategy}, ".npy")
+
+def _starts_file(book_file: str) -> str:
+    return splitext(book_file)[0] + ".starts.json"
+
+"""
+Build the opening book for a strategy by playing its first two moves for every
+starting word and feedback, and save it to the artifact cache
+"""
+def build_opening_book(word_list: List[str], strategy: str = "std_dev", starting_words: List[str] = MERGED_STARTING_WORDS, third_guesses: bool = True) -> OpeningBook:
+    next_guess = STRATEGIES[strategy]
+    matrix = get_feedback_matrix(word_list)
+    session = SolverSession(word_list, matrix=matrix, use_book=False)
+    dtype = np.int16 if len(word_list) < 2 ** 15 else np.int32
+    table = np.full((len(starting_words), NUM_FEEDBACKS, 1 + NUM_FEEDBACKS), -1, dtype=dtype)
+
+    for s, starting_word in enumerate(tqdm(starting_words)):
+        first_codes = matrix.guess_row(starting_word, session.candidate_ids)
+        for first in np.unique(first_codes).tolist():
+            if first == SOLVED_CODE:
+                continue
+
+            session.apply(starting_word, FEEDBACK_STRINGS[first])
+            second_guess = next_guess(session)
+            table[s, first, 0] = matrix.index[second_guess]
+
+            if third_guesses:
+                second_codes = matrix.guess_row(second_guess, session.candidate_ids)
+                for second in np.unique(second_codes).tolist():
+                    if second == SOLVED_CODE:
+                        continue
+
+                    session.apply(second_guess, FEEDBACK_STRINGS[second])
+                    table[s, first, 1 + second] = matrix.index[next_guess(session)]
+                    session.undo()
+
+            session.undo()
+
+    book_file = _book_file(word_list, strategy)
+    temp_book = temp_path(book_file)
+    temp_starts = temp_path(_starts_file(book_file))
+    np.save(temp_book, table)
+    with open(temp_starts, "w") as outfile:
+        json.dump(starting_words, outfile)
+
+    # Never write over the old book in place, other processes may have it mapped
+    replace_with_sidecar(temp_book, book_file, temp_starts, _starts_file(book_file))
+    default_cache.commit(book_file)
+
+    book = OpeningBook(word_list, starting_words, np.load(book_file, mmap_mode="r"))
+    _books[(tuple(word_list), strategy)] = book
+    return book
+
+# Books by word list and strategy, None for ones that haven't been built
+_books: Dict[tuple, OpeningBook] = {}
+
+"""
+The opening book for a word list and strategy, memory mapped from the artifact
+cache, or None if it hasn't been built. Either answer is remembered, so only
+the first call looks in the cache
+"""
+def get_opening_book(word_list: List[str], strategy: str = "std_dev") -> OpeningBook:
+    key = (tuple(word_list), strategy)
+    if key not in _books:
+        book_file = _book_file(word_list, strategy)
+        if not exists(book_file) or not exists(_starts_file(book_file)):
+            _books[key] = None
+            return None
+
+        with open(_starts_file(book_file)) as file:
+            starting_words = json.load(file)
+        _books[key] = OpeningBook(word_list, starting_words, np.load(book_file, mmap_mode="r"))
+
+    return _books[key]
+
+"""
+Look the next guess up in the opening book, if there is one and it covers the
+game. Returns None otherwise
+"""
+def opening_book_guess(guesses: List[str], feedbacks: List[str], word_list: List[str], strategy: str = "std_dev") -> str:
+    if not 1 <= len(guesses) <= 2:
+        return None
+
+    book = get_opening_book(word_list, strategy)
+    return book.lookup(guesses, feedbacks) if book is not None else None
+
+if __name__ == '__main__':
+    word_list = get_solution_words() if "--solutions-only" in sys.argv else get_all_words()
+    for strategy in STRATEGIES:
+        build_opening_book(word_list, strategy)
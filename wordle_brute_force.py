@@ -1,8 +1,15 @@
-import json
 import math
+import numpy as np
 import queue
+import time
 from tqdm import tqdm
-from typing import List
+from typing import List, Tuple
+from wordle_feedback import FEEDBACK_STRINGS, SOLVED_CODE
+from wordle_index import get_word_index
+from wordle_scoring import bucket_counts, partition_signature
+from wordle_session import SolverSession
+from wordle_trace import tracer
+from wordle_words import get_all_words
 
 letters = "abcdefghijklmnopqrstuvwxyz"
 
@@ -10,10 +17,13 @@ letters = "abcdefghijklmnopqrstuvwxyz"
 # compare two strings. Here we enumerate all of them
 feedbacks = ['11112', '11113', '11121', '11122', '11123', '11131', '11132', '11133', '11211', '11212', '11213', '11221', '11222', '11223', '11231', '11232', '11233', '11311', '11312', '11313', '11321', '11322', '11323', '11331', '11332', '11333', '12111', '12112', '12113', '12121', '12122', '12123', '12131', '12132', '12133', '12211', '12212', '12213', '12221', '12222', '12223', '12231', '12232', '12233', '12311', '12312', '12313', '12321', '12322', '12323', '12331', '12332', '12333', '13111', '13112', '13113', '13121', '13122', '13123', '13131', '13132', '13133', '13211', '13212', '13213', '13221', '13222', '13223', '13231', '13232', '13233', '13311', '13312', '13313', '13321', '13322', '13323', '13331', '13332', '13333', '21111', '21112', '21113', '21121', '21122', '21123', '21131', '21132', '21133', '21211', '21212', '21213', '21221', '21222', '21223', '21231', '21232', '21233', '21311', '21312', '21313', '21321', '21322', '21323', '21331', '21332', '21333', '22111', '22112', '22113', '22121', '22122', '22123', '22131', '22132', '22133', '22211', '22212', '22213', '22221', '22222', '22223', '22231', '22232', '22233', '22311', '22312', '22313', '22321', '22322', '22323', '22331', '22332', '22333', '23111', '23112', '23113', '23121', '23122', '23123', '23131', '23132', '23133', '23211', '23212', '23213', '23221', '23222', '23223', '23231', '23232', '23233', '23311', '23312', '23313', '23321', '23322', '23323', '23331', '23332', '23333', '31111', '31112', '31113', '31121', '31122', '31123', '31131', '31132', '31133', '31211', '31212', '31213', '31221', '31222', '31223', '31231', '31232', '31233', '31311', '31312', '31313', '31321', '31322', '31323', '31331', '31332', '31333', '32111', '32112', '32113', '32121', '32122', '32123', '32131', '32132', '32133', '32211', '32212', '32213', '32221', '32222', '32223', '32231', '32232', '32233', '32311', '32312', '32313', '32321', '32322', '32323', '32331', '32332', '32333', '33111', '33112', '33113', '33121', '33122', '33123', '33131', '33132', '33133', '33211', '33212', '33213', '33221', '33222', '33223', '33231', '33232', '33233', '33311', '33312', '33313', '33321', '33322', '33323', '33331', '33332', '33333']
 
-# Load words from the dictionary into all_words
-with open('all_words.json') as file:
-    data = json.load(file)
-    all_words = [word for word in data]
+"""
+all_words is loaded from the word file when first used
+"""
+def __getattr__(name: str) -> List[str]:
+    if name == "all_words":
+        return get_all_words()
+    raise AttributeError("module " + __name__ + " has no attribute " + name)
 
 """
 Given the current guesses and feedback, determine whether a given candidate
@@ -44,9 +54,18 @@ def _is_possible_next_guess(guesses: List[str], feedbacks: List[str], candidate:
     return True
 
 """
-Given the current guesses and feedbacks, what are all the possible next guesses
+Given the current guesses and feedbacks, what are all the possible next guesses.
+By default this intersects the precomputed letter masks of the word index; pass
+use_index=False to check every word with _is_possible_next_guess instead
 """
-def possible_next_guesses(guesses: List[str], feedbacks: List[str], word_list: List[str] = all_words) -> List[str]:
+def possible_next_guesses(guesses: List[str], feedbacks: List[str], word_list: List[str] = None, use_index: bool = True) -> List[str]:
+    if word_list is None:
+        word_list = get_all_words()
+
+    if use_index:
+        index = get_word_index(word_list)
+        return index.words_of(index.filter(guesses, feedbacks))
+
     # For each string, see if it is a valid next guess
     return [s for s in word_list if _is_possible_next_guess(guesses, feedbacks, s)]
 
@@ -72,12 +91,18 @@ find the shortest path from the most recent guess to all possible words
 To find the optimal starting word, we would call this with every possible word
 and feedback combination and find the word that gives us the best worst case
 """
-def longest_path_to_every_word(guesses: List[str], feedbacks: List[str]) -> int:
+def longest_path_to_every_word(guesses: List[str], feedbacks: List[str], session: SolverSession = None) -> int:
     # We have found the solution, so it takes us 0 more steps
     if feedbacks[-1] == "11111":
         print(guesses)
         return 0
 
+    # The session holds the candidates for the current path. Branches narrow
+    # it with apply() and backtrack with undo(), so no level re-filters the
+    # word list from scratch
+    if session is None:
+        session = SolverSession(get_all_words(), guesses, feedbacks)
+
     # We want to try every possible next guess and see which gives us the best
     # worst-case path. That is going to be our best next guess because it
     # minimizes the worst case. For our purposes, we're just counting what is
@@ -85,30 +110,207 @@ def longest_path_to_every_word(guesses: List[str], feedbacks: List[str]) -> int:
     max_path = 0
 
     # Given the current guess and feedback, what are all the possible solutions?
-    next_guesses = possible_next_guesses(guesses, feedbacks)
+    # Words already guessed are never candidates, so there are no cycles
+    next_ids = session.candidate_ids
+
+    # Guesses that split the candidates into the same buckets lead to the same
+    # paths, so only the first guess of each partition is explored
+    codes = session.matrix.lookup(next_ids, next_ids)
+    partitions = set()
 
     # For every possible guess, find the worst case path
-    for guess in next_guesses:
-        # Avoid cycles
-        if guess in guesses:
+    for g, guess_id in enumerate(next_ids.tolist()):
+        tracer.count("guesses")
+        signature = partition_signature(codes[g])
+        if signature in partitions:
+            tracer.count("guesses_collapsed")
             continue
+        partitions.add(signature)
+        guess = session.word_list[guess_id]
 
-        # For every possible solution, find the longest path
-        for solution in next_guesses:
-            feedback = get_feedback_string(guess, solution)
-
+        # For every possible feedback, find the longest path. Solutions that
+        # give the same feedback end up in the same state
+        for code in np.unique(codes[g]).tolist():
             # Update our guess
             guesses.append(guess)
-            feedbacks.append(feedback)
-            max_path = max(max_path, longest_path_to_every_word(guesses, feedbacks) + 1)
+            feedbacks.append(FEEDBACK_STRINGS[code])
+            session.apply_id(guess_id, code)
+            max_path = max(max_path, longest_path_to_every_word(guesses, feedbacks, session) + 1)
 
             # Backtrack
+            session.undo()
             guesses.pop()
             feedbacks.pop()
 
     return max_path
 
+"""
+Exact minimax search over the guesses that are still possible solutions. For a
+set of candidates it finds the smallest number of guesses that is guaranteed to
+find the solution, i.e. the best worst case. Results are kept in a
+transposition table keyed by the candidate set, and guesses are cut off as soon
+as one of their buckets can't beat the best worst case found so far
+"""
+class MinimaxSearch:
+    def __init__(self, word_list: List[str] = None):
+        if word_list is None:
+            word_list = get_all_words()
+        self.word_list = word_list
+        self.matrix = SolverSession(word_list).matrix
+        # candidate ids -> (depth, exact). If exact is False the depth is only a
+        # lower bound, because the search was cut off
+        self.table = {}
+        self.best_guesses = {}
+        self.nodes = 0
+        self.lookups = 0
+        self.hits = 0
+        # Guesses looked at in expanded nodes, and how many of them were
+        # skipped because an earlier guess had the same partition
+        self.guesses_seen = 0
+        self.guesses_collapsed = 0
+
+    """
+    Cheapest possible worst case for a set of n candidates. With 2 or more we
+    need a second guess, and one guess can split at most 243 ways
+    """
+    @staticmethod
+    def _lower_bound(n: int) -> int:
+        if n <= 1:
+            return n
+        if n <= 243:
+            return 2
+        return 3
+
+    """
+    Best worst case for the candidates, if it is less than bound. Otherwise
+    returns some value that is at least bound
+    """
+    def depth(self, candidate_ids: np.ndarray, bound: float = float('inf')) -> int:
+        n = len(candidate_ids)
+        if n <= 2:
+            return n
+
+        key = candidate_ids.tobytes()
+        lower = self._lower_bound(n)
+        self.lookups = self.lookups + 1
+        if key in self.table:
+            value, exact = self.table[key]
+            if exact or value >= bound:
+                self.hits = self.hits + 1
+                return value
+            lower = max(lower, value)
+
+        if lower >= bound:
+            return lower
+
+        self.nodes = self.nodes + 1
+        codes = self.matrix.lookup(candidate_ids, candidate_ids)
+        counts = bucket_counts(self.matrix, candidate_ids, candidate_ids)
+        counts[:, SOLVED_CODE] = 0
+
+        # Try the guesses with the smallest largest bucket first, breaking ties
+        # on how even the split is. Those tend to be the best guesses, and
+        # finding a good one early makes the cut-offs kick in sooner
+        largest = counts.max(axis=1)
+        squares = (counts * counts).sum(axis=1)
+        order = np.lexsort((squares, largest))
+        largest = largest.tolist()
+        squares = squares.tolist()
+
+        # A guess with the same partition as one already searched has the same
+        # worst case. Equal partitions have equal sort keys, so partitions only
+        # need comparing within a run of guesses tied on both keys, and the one
+        # searched is the first of them in candidate order
+        run_key = None
+        run_start = None
+        partitions = None
+
+        best = bound
+        best_guess = None
+        for g in order.tolist():
+            # Guesses are sorted by largest bucket, so once that alone can't
+            # beat the best, none of the remaining guesses can either
+            if 1 + self._lower_bound(largest[g]) >= best:
+                break
+
+            self.guesses_seen = self.guesses_seen + 1
+            sort_key = (largest[g], squares[g])
+            if sort_key != run_key:
+                run_key = sort_key
+                run_start = g
+                partitions = None
+            else:
+                if partitions is None:
+                    partitions = {partition_signature(codes[run_start])}
+                signature = partition_signature(codes[g])
+                if signature in partitions:
+                    self.guesses_collapsed = self.guesses_collapsed + 1
+                    continue
+                partitions.add(signature)
+
+            # Largest buckets first, since they are the most likely to cut off
+            bucket_codes = np.flatnonzero(counts[g])
+            bucket_codes = bucket_codes[np.argsort(-counts[g][bucket_codes], kind="stable")]
+            worst = 1
+            for code in bucket_codes.tolist():
+                worst = max(worst, 1 + self.depth(candidate_ids[codes[g] == code], best - 1))
+                if worst >= best:
+                    break
+
+            if worst < best:
+                best = worst
+                best_guess = int(candidate_ids[g])
+                if best <= lower:
+                    break
+
+        if best < bound:
+            self.table[key] = (best, True)
+            self.best_guesses[key] = best_guess
+        else:
+            self.table[key] = (max(lower, bound), False)
+
+        return best if best < bound else max(lower, bound)
+
+    """
+    Best worst case and the guess that achieves it for a set of candidates
+    """
+    def solve(self, candidate_ids: np.ndarray) -> Tuple[int, str]:
+        candidate_ids = np.asarray(candidate_ids, dtype=np.int64)
+        value = self.depth(candidate_ids)
+        if len(candidate_ids) <= 2:
+            return value, self.word_list[int(candidate_ids[0])] if len(candidate_ids) else None
+
+        return value, self.word_list[self.best_guesses[candidate_ids.tobytes()]]
+
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    """
+    Fraction of guesses skipped because another guess had the same partition
+    """
+    def reduction(self) -> float:
+        return self.guesses_collapsed / self.guesses_seen if self.guesses_seen else 0.0
+
+"""
+Given a current path of guesses and feedbacks, find the best worst case number
+of further guesses (including the final, correct one) and the guess to make
+next, using exact minimax search. Also prints how much of the tree was expanded
+"""
+def optimal_worst_case_depth(guesses: List[str], feedbacks: List[str], word_list: List[str] = None) -> Tuple[int, str]:
+    if word_list is None:
+        word_list = get_all_words()
+    session = SolverSession(word_list, guesses, feedbacks)
+    search = MinimaxSearch(word_list)
+    start = time.time()
+    depth, guess = search.solve(session.candidate_ids)
+
+    print("Candidates: " + str(len(session.candidate_ids)))
+    print("Nodes expanded: " + str(search.nodes))
+    print("Cache hit rate: " + str(round(search.hit_rate() * 100, 1)) + "%")
+    print("Guesses collapsed: " + str(round(search.reduction() * 100, 1)) + "%")
+    print("Time: " + str(round(time.time() - start, 2)) + "s")
+    return depth, guess
 
 if __name__ == '__main__':
 
-    print(longest_path_to_every_word(["rates"], ["11331"]))
+    print(optimal_worst_case_depth(["rates"], ["11331"]))
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import shutil
+from os.path import exists, getmtime, getsize, isdir, join, splitext
+from typing import List
+from wordle_words import PACKAGE_DIR
+
+DEFAULT_CACHE_DIR = join(PACKAGE_DIR, ".wordle_cache")
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+# Bump this when a change to the scoring code makes old artifacts wrong
+CACHE_VERSION = 2
+
+"""
+Hash identifying an artifact: what kind of artifact it is (which scoring
+function or table), its parameters and the exact word list it was computed for
+"""
+def artifact_key(word_list: List[str], kind: str, params: dict = None) -> str:
+    digest = hashlib.sha256()
+    digest.update(json.dumps([CACHE_VERSION, kind, params or {}], sort_keys=True).encode())
+    digest.update("\n".join(word_list).encode())
+    return digest.hexdigest()[:24]
+
+"""
+Directory of precomputed artifacts addressed by artifact_key, so results for
+one word list are never handed out for another. Each artifact is one file or
+directory named <kind>-<key>, possibly with sidecar files sharing that prefix.
+Reading an artifact marks it as recently used, and once the cache grows past
+max_bytes the least recently used artifacts are deleted
+"""
+class ArtifactCache:
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    """
+    Path of the artifact for these inputs, whether or not it exists yet.
+    If it exists it is marked as used
+    """
+    def path(self, word_list: List[str], kind: str, params: dict = None, extension: str = "") -> str:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = join(self.cache_dir, kind + "-" + artifact_key(word_list, kind, params) + extension)
+        if exists(path):
+            os.utime(path)
+
+        return path
+
+    """
+    Paths of every existing artifact of a kind
+    """
+    def find(self, kind: str, extension: str = "") -> List[str]:
+        if not isdir(self.cache_dir):
+            return []
+
+        return [join(self.cache_dir, name) for name in sorted(os.listdir(self.cache_dir)) if name.startswith(kind + "-") and name.endswith(extension)]
+
+    """
+    Call after writing an artifact. Marks it as used and evicts the least
+    recently used artifacts until the cache fits in max_bytes again
+    """
+    def commit(self, path: str) -> None:
+        os.utime(path)
+        self.evict(keep=self._entry(os.path.basename(path)))
+
+    @staticmethod
+    def _entry(name: str) -> str:
+        return name.split(".")[0]
+
+    @staticmethod
+    def _size(path: str) -> int:
+        if not isdir(path):
+            return getsize(path)
+
+        size = 0
+        for root, _, files in os.walk(path):
+            for name in files:
+                size = size + getsize(join(root, name))
+        return size
+
+    def evict(self, keep: str = None) -> None:
+        if not isdir(self.cache_dir):
+            return
+
+        # Group files by artifact so sidecars go together with their artifact
+        entries = {}
+        for name in os.listdir(self.cache_dir):
+            path = join(self.cache_dir, name)
+            entry = entries.setdefault(self._entry(name), {"paths": [], "size": 0, "used": 0})
+            entry["paths"].append(path)
+            entry["size"] = entry["size"] + self._size(path)
+            entry["used"] = max(entry["used"], getmtime(path))
+
+        total = sum(entry["size"] for entry in entries.values())
+        for name, entry in sorted(entries.items(), key=lambda item: item[1]["used"]):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+
+            for path in entry["paths"]:
+                if isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                elif exists(path):
+                    os.remove(path)
+            total = total - entry["size"]
+
+default_cache = ArtifactCache()
+
+"""
+Where to write a file before moving it into place with replace_with_sidecar.
+Unique to this process, and it keeps the extension so numpy doesn't add one
+"""
+def temp_path(path: str) -> str:
+    base, extension = splitext(path)
+    return base + "." + str(os.getpid()) + ".tmp" + extension
+
+"""
+Move a finished file and the sidecar describing it from their temp paths into
+place. The old sidecar goes first and the new one comes last, so a reader that
+finds both files always finds a complete pair that belongs together
+"""
+def replace_with_sidecar(temp_file: str, file_name: str, temp_sidecar: str, sidecar: str) -> None:
+    if exists(sidecar):
+        os.remove(sidecar)
+    os.replace(temp_file, file_name)
+    os.replace(temp_sidecar, sidecar)
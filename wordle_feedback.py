@@ -0,0 +1,278 @@
+import json
+import numpy as np
+from os.path import exists, splitext
+from tqdm import tqdm
+from typing import Dict, List, Tuple
+from wordle_cache import default_cache, replace_with_sidecar, temp_path
+from wordle_words import WORD_LENGTH, get_all_words
+
+# Feedback strings are written with '1' (green), '2' (yellow) and '3' (grey).
+# We store them as base-3 integers where each digit is one less than the
+# character, so '11111' is 0 and '33333' is 242. This keeps the ordering of
+# the strings, so FEEDBACK_STRINGS[code] is the string for that code and every
+# feedback fits in a single uint8
+NUM_FEEDBACKS = 3 ** WORD_LENGTH
+SOLVED_CODE = 0
+FEEDBACK_STRINGS = []
+for _code in range(NUM_FEEDBACKS):
+    _digits = []
+    for _ in range(WORD_LENGTH):
+        _digits.append(str(_code % 3 + 1))
+        _code = _code // 3
+    FEEDBACK_STRINGS.append("".join(reversed(_digits)))
+
+# Number of grey letters in each feedback code
+GREY_COUNTS = np.array([f.count('3') for f in FEEDBACK_STRINGS], dtype=np.int64)
+
+"""
+Convert a feedback string like '32331' into its base-3 code
+"""
+def encode_feedback(feedback: str) -> int:
+    code = 0
+    for c in feedback:
+        code = code * 3 + ord(c) - ord('1')
+    return code
+
+"""
+Convert a base-3 feedback code back into its feedback string
+"""
+def decode_feedback(code: int) -> str:
+    return FEEDBACK_STRINGS[code]
+
+"""
+Pack a list of words into an N x 5 array of letter indices (a = 0) and a
+26-bit mask per word recording which letters appear in it
+"""
+def pack_words(word_list: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    letters = np.frombuffer("".join(word_list).encode("ascii"), dtype=np.uint8)
+    letters = (letters - ord('a')).reshape(len(word_list), WORD_LENGTH)
+
+    masks = np.zeros(len(word_list), dtype=np.uint32)
+    for i in range(WORD_LENGTH):
+        masks |= np.left_shift(np.uint32(1), letters[:, i].astype(np.uint32))
+
+    return letters, masks
+
+"""
+Compact form of a word list: the letters of every word in one contiguous N x 5
+uint8 array and a 26-bit letter mask per word, plus the id of each word. Words
+are addressed by id everywhere in the solver, and only turned back into
+strings at the API boundary
+"""
+class PackedWords:
+    __slots__ = ("words", "index", "letters", "masks")
+
+    def __init__(self, word_list: List[str]):
+        self.words = word_list
+        self.index = {word: i for i, word in enumerate(word_list)}
+        self.letters, self.masks = pack_words(word_list)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def id_of(self, word: str) -> int:
+        return self.index[word]
+
+    def word_of(self, word_id: int) -> str:
+        return self.words[word_id]
+
+    """
+    Letters of a word, which doesn't need to be in the word list
+    """
+    def letters_of(self, word: str) -> np.ndarray:
+        if word in self.index:
+            return self.letters[self.index[word]]
+        return pack_words([word])[0][0]
+
+    """
+    Bytes taken by the packed letters and masks
+    """
+    def nbytes(self) -> int:
+        return self.letters.nbytes + self.masks.nbytes
+
+"""
+Compute the feedback code for every guess/solution pair. Same rules as
+get_feedback_string: green if the letters match, yellow if the guessed letter
+is anywhere in the solution, grey otherwise. Returns a (guesses x solutions)
+uint8 array
+"""
+def feedback_codes(guess_letters: np.ndarray, solution_letters: np.ndarray, solution_masks: np.ndarray) -> np.ndarray:
+    codes = np.zeros((len(guess_letters), len(solution_letters)), dtype=np.uint8)
+    for i in range(WORD_LENGTH):
+        guess_column = guess_letters[:, i][:, None]
+        green = guess_column == solution_letters[None, :, i]
+        present = (solution_masks[None, :] >> guess_column.astype(np.uint32)) & 1
+        # Green is digit 0, yellow is 1 and grey is 2
+        digit = np.where(green, 0, 2 - present).astype(np.uint8)
+        codes *= 3
+        codes += digit
+
+    return codes
+
+"""
+Feedback lookups for a fixed word list, addressed by the position of each word
+in that list. If a precomputed matrix has been built we read codes from it
+(memory mapped, so worker processes share the page cache). Otherwise codes are
+computed on demand from the packed words
+"""
+class FeedbackMatrix:
+    def __init__(self, word_list: List[str], codes: np.ndarray = None, ids: np.ndarray = None):
+        self.packed = PackedWords(word_list)
+        self.words = word_list
+        self.index = self.packed.index
+        self.letters = self.packed.letters
+        self.masks = self.packed.masks
+        # Full precomputed matrix and, if word_list is a subset of the words
+        # it was built for, the row/column of each of our words in it
+        self.codes = codes
+        self.ids = ids
+
+    def ids_of(self, words: List[str]) -> np.ndarray:
+        return np.array([self.index[word] for word in words], dtype=np.int64)
+
+    """
+    Feedback codes for every pair of guess ids and solution ids
+    """
+    def lookup(self, guess_ids: np.ndarray, solution_ids: np.ndarray) -> np.ndarray:
+        guess_ids = np.asarray(guess_ids, dtype=np.int64)
+        solution_ids = np.asarray(solution_ids, dtype=np.int64)
+        if self.codes is None:
+            return feedback_codes(self.letters[guess_ids], self.letters[solution_ids], self.masks[solution_ids])
+
+        if self.ids is not None:
+            guess_ids = self.ids[guess_ids]
+            solution_ids = self.ids[solution_ids]
+        return self.codes[np.ix_(guess_ids, solution_ids)]
+
+    """
+    Feedback codes for one guess against a set of solution ids
+    """
+    def row(self, guess_id: int, solution_ids: np.ndarray) -> np.ndarray:
+        if self.codes is None or self.ids is not None:
+            return self.lookup([guess_id], solution_ids)[0]
+
+        return self.codes[guess_id][solution_ids]
+
+    """
+    Feedback codes for a guess given as packed letters against a set of
+    solution ids. The guess doesn't need to be in the word list
+    """
+    def letters_row(self, guess_letters: np.ndarray, solution_ids: np.ndarray) -> np.ndarray:
+        solution_ids = np.asarray(solution_ids, dtype=np.int64)
+        return feedback_codes(guess_letters.reshape(1, WORD_LENGTH), self.letters[solution_ids], self.masks[solution_ids])[0]
+
+    """
+    Feedback codes for a guess given as a string against a set of solution
+    ids. The guess doesn't need to be in the word list
+    """
+    def guess_row(self, guess: str, solution_ids: np.ndarray) -> np.ndarray:
+        if guess in self.index:
+            return self.row(self.index[guess], solution_ids)
+
+        return self.letters_row(self.packed.letters_of(guess), solution_ids)
+
+    """
+    Feedback code for a single guess id and solution id
+    """
+    def code(self, guess_id: int, solution_id: int) -> int:
+        if self.codes is None:
+            return int(self.row(guess_id, [solution_id])[0])
+
+        if self.ids is not None:
+            guess_id = self.ids[guess_id]
+            solution_id = self.ids[solution_id]
+        return int(self.codes[guess_id, solution_id])
+
+    def feedback(self, guess: str, solution: str) -> int:
+        return self.code(self.index[guess], self.index[solution])
+
+def _words_file(file_name: str) -> str:
+    return splitext(file_name)[0] + ".words.json"
+
+"""
+One-time build step. Writes the feedback code of every guess/solution pair in
+word_list to an on-disk uint8 matrix (row = guess id, column = solution id)
+along with the word list it was built for. By default the matrix goes into the
+artifact cache under the hash of word_list
+"""
+def build_feedback_matrix(word_list: List[str], file_name: str = None, chunk_size: int = 256) -> str:
+    cached = file_name is None
+    if cached:
+        file_name = default_cache.path(word_list, "feedback_matrix", extension=".npy")
+
+    # Build under temp names so a reader never maps a half-written matrix
+    temp_file = temp_path(file_name)
+    temp_words = temp_path(_words_file(file_name))
+
+    letters, masks = pack_words(word_list)
+    codes = np.lib.format.open_memmap(temp_file, mode="w+", dtype=np.uint8, shape=(len(word_list), len(word_list)))
+
+    for start in tqdm(range(0, len(word_list), chunk_size)):
+        end = min(start + chunk_size, len(word_list))
+        codes[start:end] = feedback_codes(letters[start:end], letters, masks)
+
+    codes.flush()
+    del codes
+
+    with open(temp_words, "w") as outfile:
+        json.dump(word_list, outfile)
+
+    replace_with_sidecar(temp_file, file_name, temp_words, _words_file(file_name))
+    if cached:
+        default_cache.commit(file_name)
+
+    return file_name
+
+"""
+Open a matrix file if it was built for word_list or a superset of it
+"""
+def _open_matrix(word_list: List[str], file_name: str) -> FeedbackMatrix:
+    if not exists(file_name) or not exists(_words_file(file_name)):
+        return None
+
+    with open(_words_file(file_name)) as file:
+        matrix_words = json.load(file)
+
+    if matrix_words == word_list:
+        return FeedbackMatrix(word_list, np.load(file_name, mmap_mode="r"))
+
+    matrix_index = {word: i for i, word in enumerate(matrix_words)}
+    if all(word in matrix_index for word in word_list):
+        ids = np.array([matrix_index[word] for word in word_list], dtype=np.int64)
+        return FeedbackMatrix(word_list, np.load(file_name, mmap_mode="r"), ids)
+
+    return None
+
+_matrices: Dict[tuple, FeedbackMatrix] = {}
+
+"""
+Get the feedback lookups for a word list. Uses the precomputed matrix for
+word_list from the artifact cache (or from file_name, if given). Failing that,
+a cached matrix built for a superset of word_list is used, and if there is
+none the codes are computed on demand
+"""
+def get_feedback_matrix(word_list: List[str], file_name: str = None) -> FeedbackMatrix:
+    key = (tuple(word_list), file_name)
+    if key in _matrices:
+        return _matrices[key]
+
+    if file_name is not None:
+        candidates = [file_name]
+    else:
+        exact = default_cache.path(word_list, "feedback_matrix", extension=".npy")
+        candidates = [exact] + [path for path in default_cache.find("feedback_matrix", ".npy") if path != exact]
+
+    matrix = None
+    for path in candidates:
+        matrix = _open_matrix(word_list, path)
+        if matrix is not None:
+            break
+
+    if matrix is None:
+        matrix = FeedbackMatrix(word_list)
+
+    _matrices[key] = matrix
+    return matrix
+
+if __name__ == '__main__':
+    print(build_feedback_matrix(get_all_words()))
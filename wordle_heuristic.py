@@ -1,24 +1,40 @@
 import json
 import math
 import queue
+import sys
 from queue import PriorityQueue
-from os.path import exists
-from tqdm import tqdm
-from typing import List
+from os.path import basename, exists
+from typing import TYPE_CHECKING, Callable, List, Tuple
+from wordle_cache import default_cache
+from wordle_index import get_word_index
+from wordle_store import ScoreStore
+from wordle_trace import tracer
+from wordle_words import get_all_words, get_solution_words, load_words
+
+# numpy and the modules built on it are imported by the functions that use
+# them, so importing this module and asking for a late game guess doesn't pay
+# for loading them
+if TYPE_CHECKING:
+    import numpy as np
+    from wordle_scoring import GuessScores
+    from wordle_session import SolverSession
 
 # There are 3^5 (243) different possible feedbacks that we can get when we
 # compare two strings. Here we enumerate all of them
 feedbacks = ['11112', '11113', '11121', '11122', '11123', '11131', '11132', '11133', '11211', '11212', '11213', '11221', '11222', '11223', '11231', '11232', '11233', '11311', '11312', '11313', '11321', '11322', '11323', '11331', '11332', '11333', '12111', '12112', '12113', '12121', '12122', '12123', '12131', '12132', '12133', '12211', '12212', '12213', '12221', '12222', '12223', '12231', '12232', '12233', '12311', '12312', '12313', '12321', '12322', '12323', '12331', '12332', '12333', '13111', '13112', '13113', '13121', '13122', '13123', '13131', '13132', '13133', '13211', '13212', '13213', '13221', '13222', '13223', '13231', '13232', '13233', '13311', '13312', '13313', '13321', '13322', '13323', '13331', '13332', '13333', '21111', '21112', '21113', '21121', '21122', '21123', '21131', '21132', '21133', '21211', '21212', '21213', '21221', '21222', '21223', '21231', '21232', '21233', '21311', '21312', '21313', '21321', '21322', '21323', '21331', '21332', '21333', '22111', '22112', '22113', '22121', '22122', '22123', '22131', '22132', '22133', '22211', '22212', '22213', '22221', '22222', '22223', '22231', '22232', '22233', '22311', '22312', '22313', '22321', '22322', '22323', '22331', '22332', '22333', '23111', '23112', '23113', '23121', '23122', '23123', '23131', '23132', '23133', '23211', '23212', '23213', '23221', '23222', '23223', '23231', '23232', '23233', '23311', '23312', '23313', '23321', '23322', '23323', '23331', '23332', '23333', '31111', '31112', '31113', '31121', '31122', '31123', '31131', '31132', '31133', '31211', '31212', '31213', '31221', '31222', '31223', '31231', '31232', '31233', '31311', '31312', '31313', '31321', '31322', '31323', '31331', '31332', '31333', '32111', '32112', '32113', '32121', '32122', '32123', '32131', '32132', '32133', '32211', '32212', '32213', '32221', '32222', '32223', '32231', '32232', '32233', '32311', '32312', '32313', '32321', '32322', '32323', '32331', '32332', '32333', '33111', '33112', '33113', '33121', '33122', '33123', '33131', '33132', '33133', '33211', '33212', '33213', '33221', '33222', '33223', '33231', '33232', '33233', '33311', '33312', '33313', '33321', '33322', '33323', '33331', '33332', '33333']
 
-# Load words from the dictionary into all_words
-with open('all_words.json') as file:
-    data = json.load(file)
-    all_words = [word for word in data]
+# Until numpy has been imported, a next guess with up to this many candidates
+# is scored in plain Python. That takes a few milliseconds, where importing
+# numpy takes over a hundred, so a one-off late game suggestion stays fast
+LATE_GAME_CANDIDATES = 64
 
-# Load words from the dictionary into all_words
-with open('solution_words.json') as file:
-    data = json.load(file)
-    solution_words = [word for word in data]
+"""
+all_words and solution_words are loaded from the word file when first used
+"""
+def __getattr__(name: str) -> List[str]:
+    if name in ("all_words", "solution_words"):
+        return load_words(name)
+    raise AttributeError("module " + __name__ + " has no attribute " + name)
 
 
 """
@@ -50,9 +66,18 @@ def _is_possible_next_guess(guesses: List[str], feedbacks: List[str], candidate:
     return True
 
 """
-Given the current guesses and feedbacks, what are all the possible next guesses
+Given the current guesses and feedbacks, what are all the possible next guesses.
+By default this intersects the precomputed letter masks of the word index; pass
+use_index=False to check every word with _is_possible_next_guess instead
 """
-def possible_next_guesses(guesses: List[str], feedbacks: List[str], word_list: List[str] = all_words) -> List[str]:
+def possible_next_guesses(guesses: List[str], feedbacks: List[str], word_list: List[str] = None, use_index: bool = True) -> List[str]:
+    if word_list is None:
+        word_list = get_all_words()
+
+    if use_index:
+        index = get_word_index(word_list)
+        return index.words_of(index.filter(guesses, feedbacks))
+
     # For each string, see if it is a valid next guess
     return [s for s in word_list if _is_possible_next_guess(guesses, feedbacks, s)]
 
@@ -119,75 +144,96 @@ def find_n_smallest(data: dict, n: int = 1) -> dict:
     return to_return
 
 
+# JSON score files written before the artifact cache, by the kind of score
+# they hold. Only these are read back, and only for their own kind
+LEGACY_SCORE_FILES = {
+    "std_devs.json": "std_dev_scores",
+    "std_devs_solutions_only.json": "std_dev_scores",
+    "test_std_dev.json": "std_dev_scores",
+    "max_infos.json": "max_info_scores",
+    "max_infos_solutions_only.json": "max_info_scores",
+    "test_max_info.json": "max_info_scores",
+}
+
 """
-Find the starting word that divides all other words into the most even buckets
-by feedback. Calculation is pretty time consuming so it saves all standard
-deviations to a file. Returns the string with the lowest standard deviation
+Score every word in word_list as a starting word. Scores are appended batch by
+batch to a store in the artifact cache, keyed by the word list and the kind of
+score, so an interrupted sweep carries on where it stopped instead of starting
+over. A legacy JSON file in file_name (see LEGACY_SCORE_FILES) is reused if it
+holds this kind of score for exactly word_list. score_batch maps an array of guess ids to their scores.
+Returns a dict of word to score, and writes it to file_name if export_json is
+set
 """
-def best_dividing_word_std_dev(word_list: List[str] = all_words, file_name: str = "test_std_dev.json", num_results: int = 1) -> dict:
-    # We will calculate the standard deviation for the bucketing of each
-    # possible starting word
-    std_devs = {}
+def _sweep(word_list: List[str], kind: str, file_name: str, score_batch: Callable[['np.ndarray'], 'np.ndarray'], export_json: bool, batch_size: int = 64) -> dict:
+    import numpy as np
+    from tqdm import tqdm
 
-    # Check if file exists. If so, don't recompute
-    if exists(file_name):
+    store_file = default_cache.path(word_list, kind, extension=".scores")
+    store = ScoreStore(store_file, len(word_list))
+    if not store.complete and not store.scores and LEGACY_SCORE_FILES.get(basename(file_name)) == kind and exists(file_name):
         with open(file_name) as file:
-            std_devs = json.load(file)
-    else:
-        # Go through every possible guess/solution pair
-        for guess in tqdm(word_list):
-            counts = {}
-
-            # Initialize for every feedback. Even empty ones should be included in
-            # standard deviation
-            for feedback in feedbacks:
-                counts[feedback] = 0
-
-            # Every word is a possible solution
-            for solution in word_list:
-                # We don't include '11111' in feedbacks, so just skip this
-                if guess == solution:
-                    continue
-
-                # Get feedback string and update sum
-                curr_feedback = get_feedback_string(guess, solution)
-                counts[curr_feedback] = counts[curr_feedback] + 1
-
-            # Compute standard deviation
-            std_devs[guess] = dict_std_dev(counts)
-
-            with open(file_name, "w") as outfile:
-                json.dump(std_devs, outfile)
+            results = json.load(file)
+        if set(results) == set(word_list):
+            return results
+
+    if not store.complete:
+        remaining = np.array([i for i in range(len(word_list)) if i not in store.scores], dtype=np.int64)
+        for start in tqdm(range(0, len(remaining), batch_size)):
+            batch = remaining[start:start + batch_size]
+            store.append(dict(zip(batch.tolist(), score_batch(batch).tolist())))
+        store.finish()
+        default_cache.commit(store_file)
+
+    results = {word_list[i]: store.scores[i] for i in range(len(word_list))}
+    if export_json:
+        with open(file_name, "w") as outfile:
+            json.dump(results, outfile)
 
+    return results
 
+"""
+Find the starting word that divides all other words into the most even buckets
+by feedback. Calculation is pretty time consuming so it saves all standard
+deviations to a file. Returns the string with the lowest standard deviation
+"""
+def best_dividing_word_std_dev(word_list: List[str] = None, file_name: str = "test_std_dev.json", num_results: int = 1, export_json: bool = False) -> dict:
+    import numpy as np
+    from wordle_feedback import get_feedback_matrix
+    from wordle_scoring import bucket_codes_after, score_guesses
+
+    if word_list is None:
+        word_list = get_all_words()
+    matrix = get_feedback_matrix(word_list)
+    solution_ids = np.arange(len(word_list))
+
+    # Every word is a possible solution. The standard deviation is over every
+    # feedback but '11111', even empty ones
+    def score_batch(guess_ids: np.ndarray) -> np.ndarray:
+        return score_guesses(matrix, guess_ids, solution_ids, bucket_codes_after()).std_devs
+
+    std_devs = _sweep(word_list, "std_dev_scores", file_name, score_batch, export_json)
     return find_n_smallest(std_devs, num_results)
 
 """
 Find the starting word with the fewest number of letters not included in the
-solution. Generates json file with the counts of '33333' feedback for each word
+solution. Saves the counts of '33333' feedback for each word
 """
-def best_dividing_word_max_info(word_list: List[str] = all_words, file_name: str = "test_max_info.json", num_results: int = 1) -> dict:
-    words = {}
-
-    # Check if file exists. If so, don't recompute
-    if exists(file_name):
-        with open(file_name) as file:
-            words = json.load(file)
-    else:
-        # For every guess/solution pair, see if the result is '33333' and if so
-        # add it to the count
-        for guess in tqdm(word_list):
-            count = 0
-            for solution in word_list:
-                curr_feedback = get_feedback_string(guess, solution)
-                if curr_feedback == "33333":
-                    count = count+1
-
-                words[guess] = count
-
-        with open(file_name, "w") as outfile:
-            json.dump(words, outfile)
-
+def best_dividing_word_max_info(word_list: List[str] = None, file_name: str = "test_max_info.json", num_results: int = 1, export_json: bool = False) -> dict:
+    import numpy as np
+    from wordle_feedback import NUM_FEEDBACKS, get_feedback_matrix
+    from wordle_scoring import bucket_counts
+
+    if word_list is None:
+        word_list = get_all_words()
+    matrix = get_feedback_matrix(word_list)
+    solution_ids = np.arange(len(word_list))
+
+    # For every guess/solution pair, see if the result is '33333' and if so
+    # add it to the count
+    def score_batch(guess_ids: np.ndarray) -> np.ndarray:
+        return bucket_counts(matrix, guess_ids, solution_ids)[:, NUM_FEEDBACKS - 1]
+
+    words = {word: int(count) for word, count in _sweep(word_list, "max_info_scores", file_name, score_batch, export_json).items()}
     return find_n_smallest(words, num_results)
 
 """
@@ -220,118 +266,258 @@ def _possible_feedbacks_inner(curr_feedback: str, result: List[str], idx: int =
         _possible_feedbacks_inner(curr_feedback, result, idx+1, path)
         path.pop()
 
+"""
+Given the current game state, score every possible next guess against every
+remaining candidate in one batched pass. Returns the candidates along with their
+std dev, grey count and entropy scores
+"""
+def next_guess_scores(curr_guesses: List[str], curr_feedbacks: List[str], word_list: List[str] = None) -> Tuple[List[str], 'GuessScores']:
+    from wordle_feedback import encode_feedback, get_feedback_matrix
+    from wordle_scoring import score_guesses
+
+    if word_list is None:
+        word_list = get_all_words()
+    bucket_codes = [encode_feedback(f) for f in possible_feedbacks(curr_feedbacks[-1])]
+    with tracer.phase("filter"):
+        index = get_word_index(word_list)
+        possible_ids = index.ids_of(index.filter(curr_guesses, curr_feedbacks))
+        possible_words = [word_list[i] for i in possible_ids.tolist()]
+
+    tracer.count("words_scored", len(possible_ids))
+    tracer.count("feedback_evaluations", len(possible_ids) ** 2)
+    with tracer.phase("scoring"):
+        return possible_words, score_guesses(get_feedback_matrix(word_list), possible_ids, possible_ids, bucket_codes)
+
+"""
+Plain Python scores for the few candidates left late in a game, the same
+values next_guess_scores gives: the std dev of each guess's buckets (summed in
+the same order, so ties come out the same) and its total number of greys
+"""
+def _late_game_scores(candidates: List[str], last_feedback: str) -> Tuple[List[float], List[int]]:
+    buckets = possible_feedbacks(last_feedback)
+    std_devs = []
+    grey_counts = []
+    for guess in candidates:
+        counts = dict.fromkeys(buckets, 0)
+        greys = 0
+        for solution in candidates:
+            feedback = get_feedback_string(guess, solution)
+            greys = greys + feedback.count('3')
+            if solution != guess and feedback in counts:
+                counts[feedback] = counts[feedback] + 1
+
+        std_devs.append(dict_std_dev(counts))
+        grey_counts.append(greys)
+
+    return std_devs, grey_counts
+
+"""
+The remaining candidates if numpy isn't loaded yet and there are few enough of
+them to score in plain Python, otherwise None
+"""
+def _late_game_candidates(curr_guesses: List[str], curr_feedbacks: List[str], word_list: List[str]) -> List[str]:
+    if "numpy" in sys.modules:
+        return None
+
+    index = get_word_index(word_list)
+    mask = index.filter(curr_guesses, curr_feedbacks)
+    if mask.bit_count() > LATE_GAME_CANDIDATES:
+        return None
+    return index.words_of(mask)
+
 """
 Given the current game state, determine the next best move that optimally splits
 the answer space
 """
-def best_next_guess_std_dev(curr_guesses: List[str], curr_feedbacks: List[str], word_list: List[str] = all_words) -> str:
-    feedbacks = possible_feedbacks(curr_feedbacks[-1])
-    possible_words = possible_next_guesses(curr_guesses, curr_feedbacks, word_list)
-    std_devs = {}
-    for guess in possible_words:
-        counts = {}
-        for feedback in feedbacks:
-            counts[feedback] = 0
-
-        for solution in possible_words:
-            if guess == solution:
-                continue
+def best_next_guess_std_dev(curr_guesses: List[str], curr_feedbacks: List[str], word_list: List[str] = None) -> str:
+    if word_list is None:
+        word_list = get_all_words()
+
+    # A few candidates are cheaper to score than loading the opening book
+    candidates = _late_game_candidates(curr_guesses, curr_feedbacks, word_list)
+    if candidates is not None:
+        std_devs, _ = _late_game_scores(candidates, curr_feedbacks[-1])
+        return candidates[std_devs.index(min(std_devs))]
+
+    # The first two moves from common starting words are precomputed
+    if len(curr_guesses) <= 2:
+        from wordle_book import opening_book_guess
+        book_guess = opening_book_guess(curr_guesses, curr_feedbacks, word_list, "std_dev")
+        if book_guess is not None:
+            return book_guess
+
+    import numpy as np
+    possible_words, scores = next_guess_scores(curr_guesses, curr_feedbacks, word_list)
+
+    # argmin returns the first of several equally good guesses, same as
+    # find_n_smallest over the per-word std devs
+    return possible_words[int(np.argmin(scores.std_devs))]
 
-            curr_feedback = get_feedback_string(guess, solution)
-            counts[curr_feedback] = counts[curr_feedback] + 1
+"""
+Play a game out from the state in session until solution is guessed and return
+the path of guesses. next_guess picks the next guess from a SolverSession, e.g.
+SolverSession.best_next_guess_std_dev
+"""
+def play_game(session: 'SolverSession', solution: str, next_guess: Callable[['SolverSession'], str]) -> List[str]:
+    game = session.fork()
+    result = game.guesses
+    curr_word = result[-1]
+    index = game.matrix.index
+    solution_id = index[solution]
+    tracer.start_game()
+
+    # Feedback is looked up by word id, so no strings are built while playing
+    while curr_word != solution:
+        tracer.turn(len(game.candidate_ids))
+        curr_word = next_guess(game)
+        result.append(curr_word)
+        guess_id = index[curr_word]
+        with tracer.phase("feedback"):
+            code = game.matrix.code(guess_id, solution_id)
+        game.apply_id(guess_id, code)
+
+    tracer.end_game(result)
+    return result
 
-        std_devs[guess] = dict_std_dev(counts)
+"""
+Every solution with the same feedback on the starting word starts from the same
+candidates, so the testers only narrow for the first guess once per feedback
+"""
+def opening_session(session: 'SolverSession', openings: dict, starting_word: str, solution: str) -> 'SolverSession':
+    key = (starting_word, get_feedback_string(starting_word, solution))
+    if key not in openings:
+        openings[key] = session.fork()
+        openings[key].apply(*key)
 
-    smallest = find_n_smallest(std_devs)
-    return smallest[list(smallest.keys())[0]][0]
+    return openings[key]
 
 """
 Test using standard dev heuristic. For every starting word and every possible
-solution word, count the length of every path
+solution word, count the length of every path. If trace_file is given, every
+game is traced to it as JSON lines along with a summary (see wordle_trace). If
+stream_file is given, every game is also written to it as it finishes, as a
+results file with paths (see wordle_results)
 """
-def tester_std_dev(starting_words: List[str] = ["lares"], words: List[str] = all_words, result_file: str = "length_counts_std_dev.json") -> dict:
+def tester_std_dev(starting_words: List[str] = ["lares"], words: List[str] = None, result_file: str = "length_counts_std_dev.json", trace_file: str = None, stream_file: str = None) -> dict:
+    from wordle_results import ResultWriter
+    from wordle_session import SolverSession
+
+    if words is None:
+        words = get_all_words()
     lengths = {}
+    if trace_file is not None:
+        tracer.enable(trace_file)
+    stream = ResultWriter(stream_file, words, starting_words, paths=True) if stream_file is not None else None
     for word in starting_words:
         lengths[word] = {}
 
+    session = SolverSession(words)
+    openings = {}
     for word in words: #tqdm(words):
         for starting_word in starting_words:
-            curr_word = starting_word
-            result = [curr_word]
-            feedback = []
-
-            while curr_word != word:
-                feedback_str = get_feedback_string(curr_word, word)
-                feedback.append(feedback_str)
-                curr_word = best_next_guess_std_dev(result, feedback, words)
-                result.append(curr_word)
+            result = play_game(opening_session(session, openings, starting_word, word), word, SolverSession.best_next_guess_std_dev)
 
             if len(result) in lengths[starting_word]:
                 lengths[starting_word][len(result)].append(word)
             else:
                 lengths[starting_word][len(result)] = [word]
 
+            if stream is not None:
+                stream.append(result)
             print(result)
 
     with open(result_file, "w") as outfile:
         json.dump(lengths, outfile)
+    if stream is not None:
+        stream.close()
 
-    return lengths
+    if trace_file is not None:
+        summary = tracer.disable()
+        print("Traced " + str(summary["games"]) + " games to " + trace_file + ", phase seconds: " + str(summary["phases"]))
 
-def best_next_guess_max_info(curr_guesses: List[str], curr_feedbacks: List[str], word_list: List[str] = all_words) -> str:
-    if curr_feedbacks[-1].count('3') == 0:
-         return best_next_guess_std_dev(curr_guesses, curr_feedbacks)
-
-    feedbacks = possible_feedbacks(curr_feedbacks[-1])
-    possible_words = possible_next_guesses(curr_guesses, curr_feedbacks, word_list)
-
-    max_info_string = ""
-    min_unmatching = float('inf')
-    for guess in possible_words:
-        count = 0
-        for solution in possible_words:
-            if guess == solution:
-                continue
-
-            curr_feedback = get_feedback_string(guess, solution)
-            count = count+curr_feedback.count('3')
-
-        if count < min_unmatching:
-            min_unmatching = count
-            max_info_string = guess
+    return lengths
 
-    return max_info_string
+"""
+The candidate whose feedback has the fewest grey letters over the other
+candidates. Without a grey in the last feedback that tells nothing, so it
+falls back to the std dev heuristic over the same word_list (the original
+fell back to all_words whatever word_list was, which could pick a guess from
+outside it)
+"""
+def best_next_guess_max_info(curr_guesses: List[str], curr_feedbacks: List[str], word_list: List[str] = None) -> str:
+    if word_list is None:
+        word_list = get_all_words()
 
-def tester_max_info(starting_words: List[str] = ["lares"], words: List[str] = all_words, result_file: str = "length_counts_max_info.json") -> dict:
+    if curr_feedbacks[-1].count('3') == 0:
+         return best_next_guess_std_dev(curr_guesses, curr_feedbacks, word_list)
+
+    candidates = _late_game_candidates(curr_guesses, curr_feedbacks, word_list)
+    if candidates is not None:
+        if len(candidates) == 0:
+            return ""
+        _, grey_counts = _late_game_scores(candidates, curr_feedbacks[-1])
+        return candidates[grey_counts.index(min(grey_counts))]
+
+    if len(curr_guesses) <= 2:
+        from wordle_book import opening_book_guess
+        book_guess = opening_book_guess(curr_guesses, curr_feedbacks, word_list, "max_info")
+        if book_guess is not None:
+            return book_guess
+
+    import numpy as np
+    possible_words, scores = next_guess_scores(curr_guesses, curr_feedbacks, word_list)
+    if len(possible_words) == 0:
+        return ""
+
+    # Guessing the solution itself gives '11111', which has no greys, so it
+    # doesn't matter that the grey counts include it
+    return possible_words[int(np.argmin(scores.grey_counts))]
+
+def tester_max_info(starting_words: List[str] = ["lares"], words: List[str] = None, result_file: str = "length_counts_max_info.json", trace_file: str = None, stream_file: str = None) -> dict:
+    from wordle_results import ResultWriter
+    from wordle_session import SolverSession
+
+    if words is None:
+        words = get_all_words()
     lengths = {}
+    if trace_file is not None:
+        tracer.enable(trace_file)
+    stream = ResultWriter(stream_file, words, starting_words, paths=True) if stream_file is not None else None
     for word in starting_words:
         lengths[word] = {}
 
+    session = SolverSession(words)
+    openings = {}
     for word in words: #tqdm(words):
         for starting_word in starting_words:
-            curr_word = starting_word
-            result = [curr_word]
-            feedback = []
-
-            while curr_word != word:
-                feedback_str = get_feedback_string(curr_word, word)
-                feedback.append(feedback_str)
-                curr_word = best_next_guess_max_info(result, feedback, words)
-                result.append(curr_word)
+            result = play_game(opening_session(session, openings, starting_word, word), word, SolverSession.best_next_guess_max_info)
 
             if len(result) in lengths[starting_word]:
                 lengths[starting_word][len(result)].append(word)
             else:
                 lengths[starting_word][len(result)] = [word]
 
+            if stream is not None:
+                stream.append(result)
             print(result)
 
     with open(result_file, "w") as outfile:
         json.dump(lengths, outfile)
+    if stream is not None:
+        stream.close()
+
+    if trace_file is not None:
+        summary = tracer.disable()
+        print("Traced " + str(summary["games"]) + " games to " + trace_file + ", phase seconds: " + str(summary["phases"]))
 
     return lengths
 
 if __name__ == '__main__':
+    from wordle_results import analyze, print_analysis, results_from_length_counts
+
+    all_words = get_all_words()
+    solution_words = get_solution_words()
+
     # Result: ["lares", "rales", "tares", "soare", "reais"]
     print(best_dividing_word_std_dev(all_words, "std_devs.json", 5))
 
@@ -362,43 +548,7 @@ if __name__ == '__main__':
     """
 
 
-    with open('length_counts_max_info.json') as file:
-        length_counts = json.load(file)
-
-    filtered_length_counts = {}
-    for word in length_counts:
-        filtered_length_counts[word] = {}
-        for length in length_counts[word]:
-            filtered_length_counts[word][length] = []
-            for solution in length_counts[word][length]:
-                if solution in solution_words:
-                    filtered_length_counts[word][length].append(solution)
-    length_counts = filtered_length_counts
-
-    result = {}
-    for word in length_counts:
-        sum = 0
-        max = 0
-        max_words = []
-        count = 0
-        losing_words = []
-        for counts in length_counts[word]:
-            sum = sum + int(counts) * len(length_counts[word][counts])
-            if int(counts) > max:
-                max = int(counts)
-                max_words = length_counts[word][counts]
-            count = count + len(length_counts[word][counts])
-            if int(counts) > 6:
-                losing_words.extend(length_counts[word][counts])
-
-        print(word)
-        print("Average: " + str(sum/count))
-        print("Max Guesses: " + str(max))
-        print("Max Words: " + str(max_words))
-        print("Losing Words: " + str(losing_words))
-        print("Num Losting Words: " + str(len(losing_words)))
-        print()
-
+    print_analysis(analyze(results_from_length_counts('length_counts_max_info.json', all_words), solution_words))
 
     """
     tares
@@ -0,0 +1,120 @@
+from typing import TYPE_CHECKING, Dict, List
+from wordle_words import WORD_LENGTH, stored_letter_masks
+
+# numpy is only imported once a mask is too big to handle in plain Python
+if TYPE_CHECKING:
+    import numpy as np
+
+# Masks with up to this many words set are turned into ids in plain Python,
+# anything bigger goes through numpy
+SMALL_MASK = 256
+
+"""
+Bitset index over a word list, built once. Bit i of every mask stands for
+word_list[i]. For each position and letter we keep the words with that letter
+in that position, and for each letter the words that contain it anywhere.
+Filtering on a guess and its feedback then becomes a few intersections of
+these masks instead of a scan over every word. The position masks can be
+passed in, e.g. the ones stored in the word file
+"""
+class WordIndex:
+    def __init__(self, word_list: List[str], positions: List[List[int]] = None):
+        self.words = word_list
+        self.index = {word: i for i, word in enumerate(word_list)}
+        self.all_words_mask = (1 << len(word_list)) - 1
+
+        if positions is None:
+            # Collect the ids for every (position, letter) first and turn each
+            # group into a mask in one go
+            position_ids = [[[] for _ in range(26)] for _ in range(WORD_LENGTH)]
+            for i, word in enumerate(word_list):
+                for j in range(WORD_LENGTH):
+                    position_ids[j][ord(word[j]) - ord('a')].append(i)
+            positions = [[self._mask_of(ids) for ids in letters] for letters in position_ids]
+
+        self.positions = positions
+        self.contains = [0] * 26
+        for j in range(WORD_LENGTH):
+            for letter in range(26):
+                self.contains[letter] |= self.positions[j][letter]
+
+    def _mask_of(self, ids: List[int]) -> int:
+        import numpy as np
+        bits = np.zeros(len(self.words), dtype=np.uint8)
+        bits[ids] = 1
+        return int.from_bytes(np.packbits(bits, bitorder="little").tobytes(), "little")
+
+    """
+    Mask of the words consistent with a single guess and its feedback. Same
+    rules as _is_possible_next_guess: green letters must match, yellow letters
+    must be in the word but not in that position and grey letters must not be
+    in the word at all. The guess itself is never a candidate
+    """
+    def feedback_mask(self, guess: str, feedback: str) -> int:
+        mask = self.all_words_mask
+        for j in range(len(guess)):
+            letter = ord(guess[j]) - ord('a')
+            # Green
+            if feedback[j] == '1':
+                mask &= self.positions[j][letter]
+            # Yellow
+            elif feedback[j] == '2':
+                mask &= self.contains[letter] & ~self.positions[j][letter]
+            # Grey
+            else:
+                mask &= ~self.contains[letter]
+
+        if guess in self.index:
+            mask &= ~(1 << self.index[guess])
+
+        return mask
+
+    """
+    Mask of the words consistent with every guess and feedback so far
+    """
+    def filter(self, guesses: List[str], feedbacks: List[str]) -> int:
+        mask = self.all_words_mask
+        for i in range(len(guesses)):
+            mask &= self.feedback_mask(guesses[i], feedbacks[i])
+
+        return mask
+
+    """
+    Word ids set in mask, in word list order
+    """
+    def ids_of(self, mask: int) -> 'np.ndarray':
+        import numpy as np
+        num_bytes = (len(self.words) + 7) // 8
+        bits = np.unpackbits(np.frombuffer(mask.to_bytes(num_bytes, "little"), dtype=np.uint8), bitorder="little")
+        return np.flatnonzero(bits[:len(self.words)])
+
+    """
+    ids_of as a list. The few words left late in a game are read straight off
+    the set bits
+    """
+    def id_list(self, mask: int) -> List[int]:
+        if mask.bit_count() > SMALL_MASK:
+            return self.ids_of(mask).tolist()
+
+        ids = []
+        while mask:
+            lowest = mask & -mask
+            ids.append(lowest.bit_length() - 1)
+            mask ^= lowest
+        return ids
+
+    def words_of(self, mask: int) -> List[str]:
+        return [self.words[i] for i in self.id_list(mask)]
+
+_indexes: Dict[tuple, WordIndex] = {}
+
+"""
+Get the index for a word list, building it the first time it is asked for (or
+loading it from the word file if the list is one of the ones there)
+"""
+def get_word_index(word_list: List[str]) -> WordIndex:
+    key = tuple(word_list)
+    if key not in _indexes:
+        _indexes[key] = WordIndex(word_list, stored_letter_masks(word_list))
+
+    return _indexes[key]
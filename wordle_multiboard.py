@@ -0,0 +1,234 @@
+import argparse
+import itertools
+import json
+import random
+import numpy as np
+from typing import Callable, List
+from wordle_feedback import GREY_COUNTS, SOLVED_CODE, FeedbackMatrix
+from wordle_heuristic import all_words, opening_session, solution_words
+from wordle_scoring import bucket_codes_after, score_guesses_multi_board
+from wordle_session import SolverSession
+from wordle_trace import tracer
+
+# Guesses allowed per game in Dordle and Quordle
+MAX_GUESSES = {2: 7, 4: 9}
+
+# How many times the guess/candidate pairs of scoring each board on its own a
+# multi-board turn may score. Each pair costs a little more in the joint pass,
+# so this keeps a turn within about twice the time of a single board
+SCORING_BUDGET = 1.5
+
+"""
+State of a Dordle/Quordle style game: the same guesses are played on several
+boards at once, each with its own solution. Every board is a SolverSession,
+and a board drops out once its solution has been guessed. Guesses are scored
+against all unsolved boards together
+"""
+class MultiBoardSession:
+    def __init__(self, boards: List[SolverSession]):
+        self.boards = boards
+        self.solved = [False] * len(boards)
+
+    @property
+    def matrix(self) -> FeedbackMatrix:
+        return self.boards[0].matrix
+
+    @property
+    def word_list(self) -> List[str]:
+        return self.boards[0].word_list
+
+    def unsolved(self) -> List[SolverSession]:
+        return [board for board, solved in zip(self.boards, self.solved) if not solved]
+
+    """
+    Play a guess by id, given the feedback code it got on each board. Boards
+    already solved are skipped, so their codes are ignored
+    """
+    def apply_id(self, guess_id: int, codes: List[int]) -> None:
+        for b, board in enumerate(self.boards):
+            if self.solved[b]:
+                continue
+            if codes[b] == SOLVED_CODE:
+                self.solved[b] = True
+            else:
+                board.apply_id(guess_id, codes[b])
+
+    def fork(self) -> 'MultiBoardSession':
+        other = MultiBoardSession([board.fork() for board in self.boards])
+        other.solved = list(self.solved)
+        return other
+
+    """
+    The guess that can be made without scoring anything: the solution of a
+    board that only has one candidate left. None if there isn't one
+    """
+    def forced_guess(self) -> str:
+        for board in self.unsolved():
+            if len(board.candidate_ids) == 1:
+                return self.word_list[int(board.candidate_ids[0])]
+        return None
+
+    """
+    The words worth scoring as the next guess. Scoring the candidates of every
+    board against every board costs about boards ** 2 times a single board, so
+    the guesses are taken from the boards with the fewest candidates left (the
+    ones closest to being solved) first, adding boards only while the scoring
+    fits in SCORING_BUDGET times the cost of scoring each board on its own
+    """
+    def guess_ids(self) -> np.ndarray:
+        candidate_ids = sorted([board.candidate_ids for board in self.unsolved()], key=len)
+        total = sum(len(ids) for ids in candidate_ids)
+        budget = SCORING_BUDGET * sum(len(ids) ** 2 for ids in candidate_ids) / len(candidate_ids)
+
+        guess_ids = candidate_ids[0]
+        for ids in candidate_ids[1:]:
+            more_ids = np.union1d(guess_ids, ids)
+            if len(more_ids) * total > budget:
+                break
+            guess_ids = more_ids
+
+        return np.sort(guess_ids)
+
+    """
+    Score the next guesses against all unsolved boards in one batched pass.
+    Returns the guess ids with their scores. A guess taken from another board
+    usually doesn't keep a board's greens, so every board's std dev is over
+    every feedback but '11111' instead of just the ones that keep its greens.
+    On a single board, where every guess is a candidate, that ranks the
+    guesses the same way
+    """
+    def scores(self) -> tuple:
+        boards = self.unsolved()
+        candidate_ids = [board.candidate_ids for board in boards]
+        guess_ids = self.guess_ids()
+        tracer.count("words_scored", len(guess_ids))
+        tracer.count("feedback_evaluations", len(guess_ids) * sum(len(ids) for ids in candidate_ids))
+        with tracer.phase("scoring"):
+            scores = score_guesses_multi_board(self.matrix, guess_ids, candidate_ids, [bucket_codes_after()] * len(boards))
+        return guess_ids, scores
+
+    def best_next_guess_std_dev(self) -> str:
+        forced = self.forced_guess()
+        if forced is not None:
+            return forced
+
+        guess_ids, scores = self.scores()
+        return self.word_list[int(guess_ids[np.argmin(scores.std_devs)])]
+
+    """
+    Fewest grey letters summed over the boards. As on a single board, falls
+    back to std dev when no board's last feedback had a grey
+    """
+    def best_next_guess_max_info(self) -> str:
+        forced = self.forced_guess()
+        if forced is not None:
+            return forced
+
+        if all(board.state.code is not None and GREY_COUNTS[board.state.code] == 0 for board in self.unsolved()):
+            return self.best_next_guess_std_dev()
+
+        guess_ids, scores = self.scores()
+        return self.word_list[int(guess_ids[np.argmin(scores.grey_counts)])]
+
+# Named strategies: the MultiBoardSession method that picks the next guess
+MULTI_BOARD_STRATEGIES = {
+    "std_dev": MultiBoardSession.best_next_guess_std_dev,
+    "max_info": MultiBoardSession.best_next_guess_max_info,
+}
+
+"""
+Play a game out from the state in session until every board's solution has
+been guessed and return the path of guesses (without the guesses already made)
+"""
+def play_game(session: MultiBoardSession, solutions: List[str], next_guess: Callable[[MultiBoardSession], str]) -> List[str]:
+    game = session.fork()
+    index = game.matrix.index
+    solution_ids = [index[solution] for solution in solutions]
+    result = []
+    tracer.start_game()
+
+    while not all(game.solved):
+        tracer.turn(sum(len(board.candidate_ids) for board in game.unsolved()))
+        curr_word = next_guess(game)
+        result.append(curr_word)
+        guess_id = index[curr_word]
+        with tracer.phase("feedback"):
+            codes = [game.matrix.code(guess_id, solution_id) for solution_id in solution_ids]
+        game.apply_id(guess_id, codes)
+
+    tracer.end_game(result)
+    return result
+
+"""
+Solution tuples to test: every ordered tuple of distinct words if samples is
+None (len(words) ** num_boards games, so only for small lists or two boards),
+otherwise that many random ones
+"""
+def solution_tuples(words: List[str], num_boards: int, samples: int = None, seed: int = 0) -> List[tuple]:
+    if samples is None:
+        return list(itertools.permutations(words, num_boards))
+
+    rng = random.Random(seed)
+    return [tuple(rng.sample(words, num_boards)) for _ in range(samples)]
+
+"""
+tester_* for multi-board games. Every solution tuple is played from each
+starting word, and the results are grouped by the number of guesses taken,
+including the starting word. Games over the variant's guess limit are counted
+as failures
+"""
+def tester_multi_board(num_boards: int = 4, starting_words: List[str] = ["lares"], words: List[str] = all_words, strategy: str = "std_dev", samples: int = 1000, seed: int = 0, result_file: str = None, trace_file: str = None) -> dict:
+    if result_file is None:
+        result_file = "length_counts_" + str(num_boards) + "_boards_" + strategy + ".json"
+    if trace_file is not None:
+        tracer.enable(trace_file)
+
+    next_guess = MULTI_BOARD_STRATEGIES[strategy]
+    max_guesses = MAX_GUESSES.get(num_boards, num_boards + 5)
+    session = SolverSession(words)
+    openings = {}
+    lengths = {word: {} for word in starting_words}
+    failures = {word: 0 for word in starting_words}
+
+    for solutions in solution_tuples(words, num_boards, samples, seed):
+        for starting_word in starting_words:
+            # The starting word is played like any other guess, so a board it
+            # solves is done straight away
+            game = MultiBoardSession([opening_session(session, openings, starting_word, solution) for solution in solutions])
+            game.solved = [solution == starting_word for solution in solutions]
+            result = [starting_word] + play_game(game, list(solutions), next_guess)
+
+            lengths[starting_word].setdefault(len(result), []).append(list(solutions))
+            if len(result) > max_guesses:
+                failures[starting_word] = failures[starting_word] + 1
+
+            print(str(list(solutions)) + " " + str(result))
+
+    with open(result_file, "w") as outfile:
+        json.dump(lengths, outfile)
+
+    for starting_word in starting_words:
+        games = sum(len(tuples) for tuples in lengths[starting_word].values())
+        average = sum(length * len(tuples) for length, tuples in lengths[starting_word].items()) / games
+        print(starting_word + ": " + str(round(average, 3)) + " guesses on average, " + str(failures[starting_word]) + " of " + str(games) + " over " + str(max_guesses))
+
+    if trace_file is not None:
+        summary = tracer.disable()
+        print("Traced " + str(summary["games"]) + " games to " + trace_file + ", phase seconds: " + str(summary["phases"]))
+
+    return lengths
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Multi-board (Dordle/Quordle) solver tester")
+    parser.add_argument("starting_words", nargs="*", default=["lares"])
+    parser.add_argument("-b", "--boards", type=int, default=4)
+    parser.add_argument("--strategy", choices=list(MULTI_BOARD_STRATEGIES), default="std_dev")
+    parser.add_argument("--solutions-only", action="store_true", help="use solution_words instead of all_words")
+    parser.add_argument("--samples", type=int, default=1000, help="random solution tuples to play")
+    parser.add_argument("--full", action="store_true", help="play every solution tuple instead of sampling")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace-file", default=None)
+    args = parser.parse_args()
+
+    words = solution_words if args.solutions_only else all_words
+    tester_multi_board(args.boards, args.starting_words, words, args.strategy, None if args.full else args.samples, args.seed, trace_file=args.trace_file)
@@ -0,0 +1,254 @@
+import argparse
+import json
+import struct
+import numpy as np
+from os.path import getsize
+from typing import Dict, List
+from wordle_words import get_all_words
+
+MAGIC = b"WRES"
+HEADER = struct.Struct("<4sI")
+# Guesses after the starting word that fit in a stored path
+MAX_PATH_LENGTH = 15
+# Games longer than this are lost
+LOSING_LENGTH = 6
+
+def _id_type(n: int) -> str:
+    return "<u2" if n < 2 ** 16 else "<u4"
+
+"""
+Record layout of a results file: one record per game with the starting word's
+id into the starting words, the solution's id into the word list and the
+number of guesses, plus (if paths are kept) the ids of the guesses after the
+starting word, padded with -1
+"""
+def record_dtype(num_words: int, num_starting_words: int, paths: bool) -> np.dtype:
+    fields = [("start", _id_type(num_starting_words)), ("solution", _id_type(num_words)), ("length", "<u1")]
+    if paths:
+        fields.append(("path", "<i4", (MAX_PATH_LENGTH,)))
+    return np.dtype(fields)
+
+"""
+Tester results as a binary file of fixed-size records after a small JSON
+header holding the word list and starting words. Games are appended as they
+finish and flushed every flush_every games, so the file can be read (and
+analysed) while the tester is still running
+"""
+class ResultWriter:
+    def __init__(self, file_name: str, words: List[str], starting_words: List[str], paths: bool = False, flush_every: int = 64):
+        self.words = words
+        self.index = {word: i for i, word in enumerate(words)}
+        self.starts = {word: i for i, word in enumerate(starting_words)}
+        self.paths = paths
+        self.flush_every = flush_every
+        self.dtype = record_dtype(len(words), len(starting_words), paths)
+        self._pending = []
+
+        header = json.dumps({"words": words, "starting_words": starting_words, "paths": paths}).encode()
+        self._file = open(file_name, "wb")
+        self._file.write(HEADER.pack(MAGIC, len(header)) + header)
+        self._file.flush()
+
+    """
+    Record one game. path is the full list of guesses, starting word first
+    """
+    def append(self, path: List[str]) -> None:
+        record = np.zeros((), dtype=self.dtype)
+        record["start"] = self.starts[path[0]]
+        record["solution"] = self.index[path[-1]]
+        record["length"] = len(path)
+        if self.paths:
+            if len(path) - 1 > MAX_PATH_LENGTH:
+                raise ValueError("Path of " + str(len(path)) + " guesses is too long to store: " + str(path))
+            record["path"] = -1
+            record["path"][:len(path) - 1] = [self.index[guess] for guess in path[1:]]
+
+        self._pending.append(record.tobytes())
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        self._file.write(b"".join(self._pending))
+        self._file.flush()
+        self._pending = []
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
+
+"""
+Games read back from a results file. records is a structured array (memory
+mapped, so opening a file doesn't read it) with the fields of record_dtype
+"""
+class Results:
+    def __init__(self, words: List[str], starting_words: List[str], records: np.ndarray):
+        self.words = words
+        self.starting_words = starting_words
+        self.records = records
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    """
+    Full path of every game with the given starting word, by solution. Only
+    for files written with paths
+    """
+    def paths(self, starting_word: str) -> Dict[str, List[str]]:
+        games = self.records[self.records["start"] == self.starting_words.index(starting_word)]
+        return {self.words[int(game["solution"])]: [starting_word] + [self.words[i] for i in game["path"].tolist() if i >= 0] for game in games}
+
+"""
+Open a results file. Only whole records are read, so a file that is still
+being written gives every game flushed so far
+"""
+def read_results(file_name: str) -> Results:
+    with open(file_name, "rb") as file:
+        magic, header_size = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(file_name + " is not a results file")
+        header = json.loads(file.read(header_size))
+
+    dtype = record_dtype(len(header["words"]), len(header["starting_words"]), header["paths"])
+    offset = HEADER.size + header_size
+    count = (getsize(file_name) - offset) // dtype.itemsize
+    records = np.memmap(file_name, dtype=dtype, mode="r", offset=offset, shape=(count,)) if count else np.zeros(0, dtype=dtype)
+    return Results(header["words"], header["starting_words"], records)
+
+"""
+Results from a length counts file written by the testers. Every solution in it
+must be in words
+"""
+def results_from_length_counts(json_file: str, words: List[str]) -> Results:
+    with open(json_file) as file:
+        length_counts = json.load(file)
+
+    index = {word: i for i, word in enumerate(words)}
+    starting_words = list(length_counts)
+    dtype = record_dtype(len(words), len(starting_words), False)
+    records = np.zeros(sum(len(solutions) for counts in length_counts.values() for solutions in counts.values()), dtype=dtype)
+
+    i = 0
+    for s, starting_word in enumerate(starting_words):
+        for length, solutions in length_counts[starting_word].items():
+            records["start"][i:i + len(solutions)] = s
+            records["solution"][i:i + len(solutions)] = [index[solution] for solution in solutions]
+            records["length"][i:i + len(solutions)] = int(length)
+            i = i + len(solutions)
+
+    return Results(words, starting_words, records)
+
+"""
+Write results to a results file, e.g. to convert a length counts file
+"""
+def write_results(results: Results, file_name: str) -> None:
+    header = json.dumps({"words": results.words, "starting_words": results.starting_words, "paths": "path" in results.records.dtype.names}).encode()
+    with open(file_name, "wb") as outfile:
+        outfile.write(HEADER.pack(MAGIC, len(header)) + header)
+        outfile.write(np.ascontiguousarray(results.records).tobytes())
+
+"""
+The same length counts structure the testers write: path length -> solutions,
+in word order, for each starting word
+"""
+def to_length_counts(results: Results) -> dict:
+    records = np.sort(np.asarray(results.records)[["start", "solution", "length"]], order=["start", "solution"])
+    length_counts = {word: {} for word in results.starting_words}
+    for start, solution, length in records.tolist():
+        length_counts[results.starting_words[start]].setdefault(length, []).append(results.words[solution])
+    return length_counts
+
+"""
+Average, max and distribution of path lengths for each starting word, with
+the solutions that took the most guesses and the ones that took more than
+losing_length. If subset is given only games whose solution is in it count
+"""
+def analyze(results: Results, subset: List[str] = None, losing_length: int = LOSING_LENGTH) -> dict:
+    records = results.records
+    if subset is not None:
+        in_subset = np.zeros(len(results.words), dtype=bool)
+        index = {word: i for i, word in enumerate(results.words)}
+        in_subset[[index[word] for word in subset if word in index]] = True
+        records = records[in_subset[records["solution"]]]
+
+    starts = records["start"].astype(np.int64)
+    lengths = records["length"].astype(np.int64)
+    num_starts = len(results.starting_words)
+    counts = np.bincount(starts, minlength=num_starts)
+    totals = np.bincount(starts, weights=lengths, minlength=num_starts)
+    maxes = np.zeros(num_starts, dtype=np.int64)
+    np.maximum.at(maxes, starts, lengths)
+    distribution = np.zeros((num_starts, int(lengths.max(initial=0)) + 1), dtype=np.int64)
+    np.add.at(distribution, (starts, lengths), 1)
+
+    report = {}
+    for s, starting_word in enumerate(results.starting_words):
+        if counts[s] == 0:
+            continue
+
+        mine = records[starts == s]
+        report[starting_word] = {
+            "games": int(counts[s]),
+            "average": float(totals[s] / counts[s]),
+            "max": int(maxes[s]),
+            "max_words": [results.words[i] for i in mine["solution"][mine["length"] == maxes[s]].tolist()],
+            "distribution": {length: int(n) for length, n in enumerate(distribution[s].tolist()) if n},
+            "losing_words": [results.words[i] for i in mine["solution"][mine["length"] > losing_length].tolist()],
+        }
+
+    return report
+
+def print_analysis(report: dict) -> None:
+    for word, stats in report.items():
+        print(word)
+        print("Average: " + str(stats["average"]))
+        print("Max Guesses: " + str(stats["max"]))
+        print("Max Words: " + str(stats["max_words"]))
+        print("Distribution: " + str(stats["distribution"]))
+        print("Losing Words: " + str(stats["losing_words"]))
+        print("Num Losing Words: " + str(len(stats["losing_words"])))
+        print()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Analyse and convert tester results")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    analyze_parser = subparsers.add_parser("analyze", help="report path lengths per starting word")
+    analyze_parser.add_argument("file", help="results file, or a length counts .json file")
+    analyze_parser.add_argument("--words", default=None, help="word list file of a length counts file (default: all_words)")
+    analyze_parser.add_argument("--subset", default=None, help="only count solutions in this word list file, e.g. solution_words.json")
+    analyze_parser.add_argument("--losing-length", type=int, default=LOSING_LENGTH)
+    analyze_parser.add_argument("--json", action="store_true", help="print the report as JSON")
+
+    convert_parser = subparsers.add_parser("convert", help="convert a length counts .json file to a results file, or back")
+    convert_parser.add_argument("source")
+    convert_parser.add_argument("destination")
+    convert_parser.add_argument("--words", default=None, help="word list file of a length counts file (default: all_words)")
+    args = parser.parse_args()
+
+    def load(file_name: str) -> Results:
+        if not file_name.endswith(".json"):
+            return read_results(file_name)
+        words = get_all_words()
+        if args.words is not None:
+            with open(args.words) as file:
+                words = json.load(file)
+        return results_from_length_counts(file_name, words)
+
+    if args.command == "analyze":
+        subset = None
+        if args.subset is not None:
+            with open(args.subset) as file:
+                subset = json.load(file)
+
+        report = analyze(load(args.file), subset, args.losing_length)
+        if args.json:
+            print(json.dumps(report, indent=4))
+        else:
+            print_analysis(report)
+    else:
+        results = load(args.source)
+        if args.destination.endswith(".json"):
+            with open(args.destination, "w") as outfile:
+                json.dump(to_length_counts(results), outfile)
+        else:
+            write_results(results, args.destination)
@@ -0,0 +1,155 @@
+import argparse
+import json
+import os
+import time
+from multiprocessing import Pool
+from os.path import exists, join
+from typing import Dict, List, Tuple
+from wordle_cache import default_cache
+from wordle_heuristic import all_words, opening_session, play_game, solution_words
+from wordle_results import ResultWriter
+from wordle_session import STRATEGIES, SolverSession
+
+# State for each worker process, set up once by _init_worker
+_worker = {}
+
+def _init_worker(words: List[str], strategy: str) -> None:
+    _worker["session"] = SolverSession(words)
+    _worker["openings"] = {}
+    _worker["words"] = words
+    _worker["next_guess"] = STRATEGIES[strategy]
+
+"""
+Play every game in one chunk and return the path for each solution
+"""
+def _run_chunk(task: Tuple[str, int, int]) -> Tuple[str, int, int, Dict[str, List[str]]]:
+    starting_word, start, end = task
+    paths = {}
+    for word in _worker["words"][start:end]:
+        opening = opening_session(_worker["session"], _worker["openings"], starting_word, word)
+        paths[word] = play_game(opening, word, _worker["next_guess"])
+
+    return starting_word, start, end, paths
+
+def _checkpoint_file(checkpoint_dir: str, starting_word: str, start: int) -> str:
+    return join(checkpoint_dir, starting_word + "_" + str(start) + ".json")
+
+"""
+Load a finished chunk, or None if it hasn't been finished (or was written for
+a different word list)
+"""
+def _load_checkpoint(checkpoint_dir: str, starting_word: str, start: int, words: List[str]) -> Dict[str, List[str]]:
+    file_name = _checkpoint_file(checkpoint_dir, starting_word, start)
+    if not exists(file_name):
+        return None
+
+    with open(file_name) as file:
+        paths = json.load(file)
+
+    if list(paths) != words:
+        return None
+
+    return paths
+
+"""
+Write a finished chunk. Written to a temporary file first so an interrupted
+write never looks like a finished chunk
+"""
+def _save_checkpoint(checkpoint_dir: str, starting_word: str, start: int, paths: Dict[str, List[str]]) -> None:
+    file_name = _checkpoint_file(checkpoint_dir, starting_word, start)
+    with open(file_name + ".tmp", "w") as outfile:
+        json.dump(paths, outfile)
+    os.replace(file_name + ".tmp", file_name)
+
+"""
+Parallel version of tester_std_dev / tester_max_info. The (starting word,
+solution) pairs are split into chunks that are played on a process pool. Every
+finished chunk is checkpointed to checkpoint_dir (by default a directory in the
+artifact cache keyed by the word list, strategy and chunk size), so rerunning
+after an interruption, or with other starting words, only plays the chunks
+that are missing. Returns (and writes to
+result_file) the same length counts structure as the testers. If stream_file
+is given, the games of every chunk are also written to it as soon as the chunk
+is done, as a results file with paths (see wordle_results)
+"""
+def run_tester(starting_words: List[str] = ["lares"], words: List[str] = all_words, result_file: str = "length_counts_std_dev.json", strategy: str = "std_dev", processes: int = None, chunk_size: int = 64, checkpoint_dir: str = None, stream_file: str = None) -> dict:
+    cached = checkpoint_dir is None
+    if cached:
+        checkpoint_dir = default_cache.path(words, "tester_checkpoints", {"strategy": strategy, "chunk_size": chunk_size})
+    os.makedirs(checkpoint_dir, exist_ok=True)
+
+    # Pick up every chunk that was already finished
+    paths = {word: {} for word in starting_words}
+    tasks = []
+    for starting_word in starting_words:
+        for start in range(0, len(words), chunk_size):
+            end = min(start + chunk_size, len(words))
+            finished = _load_checkpoint(checkpoint_dir, starting_word, start, words[start:end])
+            if finished is None:
+                tasks.append((starting_word, start, end))
+            else:
+                paths[starting_word].update(finished)
+
+    stream = ResultWriter(stream_file, words, starting_words, paths=True) if stream_file is not None else None
+    if stream is not None:
+        for starting_word in starting_words:
+            for path in paths[starting_word].values():
+                stream.append(path)
+        stream.flush()
+
+    num_games = sum(end - start for _, start, end in tasks)
+    print("Resuming with " + str(len(starting_words) * len(words) - num_games) + " games done, " + str(num_games) + " to play")
+
+    games = 0
+    start_time = time.time()
+    with Pool(processes, initializer=_init_worker, initargs=(words, strategy)) as pool:
+        for starting_word, start, end, chunk_paths in pool.imap_unordered(_run_chunk, tasks):
+            _save_checkpoint(checkpoint_dir, starting_word, start, chunk_paths)
+            paths[starting_word].update(chunk_paths)
+            if stream is not None:
+                for path in chunk_paths.values():
+                    stream.append(path)
+                stream.flush()
+
+            games = games + end - start
+            elapsed = time.time() - start_time
+            print(str(games) + "/" + str(num_games) + " games, " + str(round(games / elapsed, 1)) + " games/second")
+
+    # Same structure as the testers: path length -> solutions, in word order
+    lengths = {}
+    for starting_word in starting_words:
+        lengths[starting_word] = {}
+        for word in words:
+            length = len(paths[starting_word][word])
+            if length in lengths[starting_word]:
+                lengths[starting_word][length].append(word)
+            else:
+                lengths[starting_word][length] = [word]
+
+    with open(result_file, "w") as outfile:
+        json.dump(lengths, outfile)
+    if stream is not None:
+        stream.close()
+
+    if cached:
+        default_cache.commit(checkpoint_dir)
+
+    return lengths
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Play every solution from each starting word in parallel")
+    parser.add_argument("starting_words", nargs="*", default=["lares","rales","tares","soare","reais","stoae","toeas","aloes","aeons","aeros", "adieu","raise","arise","irate","arose","alter","alone","audio","atone"])
+    parser.add_argument("--strategy", choices=list(STRATEGIES), default="std_dev")
+    parser.add_argument("--solutions-only", action="store_true", help="use solution_words instead of all_words")
+    parser.add_argument("--result-file", default=None)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=64)
+    parser.add_argument("--stream-file", default=None, help="also write every game to this results file as it finishes")
+    args = parser.parse_args()
+
+    words = solution_words if args.solutions_only else all_words
+    result_file = args.result_file
+    if result_file is None:
+        result_file = "length_counts_" + args.strategy + ("_solutions" if args.solutions_only else "") + ".json"
+
+    run_tester(args.starting_words, words, result_file, args.strategy, args.processes, args.chunk_size, stream_file=args.stream_file)
@@ -0,0 +1,196 @@
+import numpy as np
+from functools import lru_cache
+from typing import List, NamedTuple
+from wordle_feedback import FeedbackMatrix, GREY_COUNTS, NUM_FEEDBACKS, SOLVED_CODE, WORD_LENGTH
+
+# Upper bound on the number of guess/candidate pairs we bucket at once, so that
+# opening moves against the whole dictionary don't allocate gigabytes
+MAX_PAIRS_PER_BATCH = 1 << 22
+
+"""
+Scores for a batch of guesses against a set of candidate solutions. Every
+field is an array with one entry per guess
+ - std_devs: same value dict_std_dev gives for the guess's bucket counts
+ - grey_counts: total number of grey letters over all candidates ("max info")
+ - entropies: expected information of the guess in bits
+"""
+class GuessScores(NamedTuple):
+    std_devs: np.ndarray
+    grey_counts: np.ndarray
+    entropies: np.ndarray
+
+"""
+The feedback buckets used for the standard deviation after a given feedback, in
+the same order as possible_feedbacks: positions that were green stay green and
+every other position can be anything. Before the first guess that is every
+feedback except '11111', in the same order as feedbacks
+"""
+@lru_cache(maxsize=None)
+def bucket_codes_after(feedback: str = None) -> List[int]:
+    if feedback is None:
+        return list(range(SOLVED_CODE + 1, NUM_FEEDBACKS))
+
+    # Digits are 0 for green, so a code keeps the greens if it has a 0 digit
+    # in every green position. possible_feedbacks tries grey before yellow
+    # before green, which is descending order
+    green_positions = [WORD_LENGTH - 1 - i for i, c in enumerate(feedback) if c == '1']
+    return [code for code in range(NUM_FEEDBACKS - 1, -1, -1) if all((code // 3 ** p) % 3 == 0 for p in green_positions)]
+
+# Squares whose rounding error is within this fraction of an ulp of halfway
+# between two floats are squared again in Python. That is exact as long as the
+# C library's pow is accurate to 0.55 ulp (glibc and musl are to 0.52), since
+# anything further from halfway then rounds the same way in both
+NEAR_HALFWAY = 0.05
+
+"""
+x ** 2 for every x, rounded exactly as Python rounds it. Python squares a
+float with the C library's pow, which can differ in the last bit from the
+multiplication numpy uses for ** 2, but only when the exact square lies close
+to halfway between two floats. The exact rounding error of the multiplication
+(Dekker's product) finds those, and just they are squared in Python
+"""
+def _python_squares(x: np.ndarray) -> np.ndarray:
+    squares = x * x
+    split = x * 134217729.0
+    high = split - (split - x)
+    low = x - high
+    error = ((high * high - squares) + 2 * high * low) + low * low
+
+    # The ulp below the square, which is the smaller one at a power of two
+    ulps = np.spacing(np.nextafter(squares, 0))
+    near = np.flatnonzero(np.abs(error) > (0.5 - NEAR_HALFWAY) * ulps)
+    squares.ravel()[near] = [value ** 2 for value in x.ravel()[near].tolist()]
+    return squares
+
+"""
+(size - mean) ** 2 for every bucket size, as dict_std_dev computes it. Bucket
+sizes are small integers, so when there are fewer possible sizes than buckets
+each size is squared once per row and looked up. Otherwise most buckets are
+still empty, and those only need the square of each row's mean
+"""
+def _squared_differences(bucket_sizes: np.ndarray, avg_num_words: np.ndarray) -> np.ndarray:
+    largest = int(bucket_sizes.max(initial=0))
+    if largest < bucket_sizes.shape[1]:
+        squares = _python_squares(np.arange(largest + 1) - avg_num_words[:, None])
+        return np.take_along_axis(squares, bucket_sizes, axis=1)
+
+    squares = np.repeat(_python_squares(avg_num_words)[:, None], bucket_sizes.shape[1], axis=1)
+    nonzero = np.flatnonzero(bucket_sizes)
+    squares.ravel()[nonzero] = _python_squares(bucket_sizes.ravel()[nonzero] - avg_num_words[nonzero // bucket_sizes.shape[1]])
+    return squares
+
+"""
+Count how many candidates fall into each feedback bucket for every guess.
+Returns a (guesses x 243) array. All guesses are bucketed with a single
+bincount over feedback codes offset by the guess's row
+"""
+def bucket_counts(matrix: FeedbackMatrix, guess_ids: np.ndarray, candidate_ids: np.ndarray) -> np.ndarray:
+    guess_ids = np.asarray(guess_ids, dtype=np.int64)
+    candidate_ids = np.asarray(candidate_ids, dtype=np.int64)
+    counts = np.zeros((len(guess_ids), NUM_FEEDBACKS), dtype=np.int64)
+    if len(candidate_ids) == 0:
+        return counts
+
+    batch_size = max(1, MAX_PAIRS_PER_BATCH // len(candidate_ids))
+    for start in range(0, len(guess_ids), batch_size):
+        end = min(start + batch_size, len(guess_ids))
+        codes = matrix.lookup(guess_ids[start:end], candidate_ids).astype(np.int64)
+        codes += (np.arange(end - start, dtype=np.int64) * NUM_FEEDBACKS)[:, None]
+        counts[start:end] = np.bincount(codes.ravel(), minlength=(end - start) * NUM_FEEDBACKS).reshape(end - start, NUM_FEEDBACKS)
+
+    return counts
+
+"""
+Score every guess against the candidates in one call. bucket_codes are the
+feedback buckets included in the standard deviation, in the order the counts
+dict would be built (possible_feedbacks of the last feedback, or feedbacks for a
+starting word). As in the per-word loops, a guess is not counted against itself
+for the standard deviation
+"""
+def score_guesses(matrix: FeedbackMatrix, guess_ids: np.ndarray, candidate_ids: np.ndarray, bucket_codes: List[int]) -> GuessScores:
+    counts = bucket_counts(matrix, guess_ids, candidate_ids)
+
+    # Grey counts and entropy use every candidate, including the guess itself
+    grey_counts = counts @ GREY_COUNTS
+    total = max(len(candidate_ids), 1)
+    probabilities = counts / total
+    with np.errstate(divide="ignore", invalid="ignore"):
+        entropies = -np.where(counts > 0, probabilities * np.log2(probabilities), 0.0).sum(axis=1)
+
+    # The only way to get '11111' is to guess the solution, which we skip
+    counts[:, SOLVED_CODE] = 0
+    bucket_sizes = counts[:, np.asarray(bucket_codes, dtype=np.int64)]
+    avg_num_words = bucket_sizes.sum(axis=1) / len(bucket_codes)
+
+    # cumsum accumulates bucket by bucket in the same order as dict_std_dev
+    # does (np.sum would add pairwise), so the floats and therefore ties
+    # between guesses come out identical
+    squares = _squared_differences(bucket_sizes, avg_num_words)
+    std_devs = np.cumsum(squares, axis=1)[:, -1] if len(bucket_codes) else np.zeros(len(guess_ids))
+
+    return GuessScores(std_devs, grey_counts, entropies)
+
+"""
+Signature of the partition a guess splits the candidates into, given its
+feedback code for each candidate. Every candidate is labelled by the first
+candidate in its bucket, so two guesses get the same signature exactly when
+they put the same candidates together, whatever feedback codes they give
+"""
+def partition_signature(codes: np.ndarray) -> tuple:
+    first = {}
+    return tuple([first.setdefault(code, j) for j, code in enumerate(codes.tolist())])
+
+"""
+bucket_counts for several boards at once. boards holds the candidate ids of
+each board, and the result is a (guesses x boards x 243) array. The candidates
+of every board are looked up together and bucketed with a single bincount,
+offsetting each code by its board as well as its guess's row
+"""
+def multi_board_bucket_counts(matrix: FeedbackMatrix, guess_ids: np.ndarray, boards: List[np.ndarray]) -> np.ndarray:
+    guess_ids = np.asarray(guess_ids, dtype=np.int64)
+    candidate_ids = np.concatenate([np.asarray(board, dtype=np.int64) for board in boards])
+    counts = np.zeros((len(guess_ids), len(boards), NUM_FEEDBACKS), dtype=np.int64)
+    if len(candidate_ids) == 0:
+        return counts
+
+    board_offsets = np.repeat(np.arange(len(boards), dtype=np.int64) * NUM_FEEDBACKS, [len(board) for board in boards])
+    row_size = len(boards) * NUM_FEEDBACKS
+    batch_size = max(1, MAX_PAIRS_PER_BATCH // len(candidate_ids))
+    for start in range(0, len(guess_ids), batch_size):
+        end = min(start + batch_size, len(guess_ids))
+        codes = matrix.lookup(guess_ids[start:end], candidate_ids).astype(np.int64)
+        codes += board_offsets
+        codes += (np.arange(end - start, dtype=np.int64) * row_size)[:, None]
+        counts[start:end] = np.bincount(codes.ravel(), minlength=(end - start) * row_size).reshape(end - start, len(boards), NUM_FEEDBACKS)
+
+    return counts
+
+"""
+score_guesses for several independent boards, with bucket_codes given per
+board. Each score is the sum of the guess's score on every board, which for
+one board is exactly what score_guesses gives
+"""
+def score_guesses_multi_board(matrix: FeedbackMatrix, guess_ids: np.ndarray, boards: List[np.ndarray], bucket_codes: List[List[int]]) -> GuessScores:
+    counts = multi_board_bucket_counts(matrix, guess_ids, boards)
+    std_devs = np.zeros(len(guess_ids))
+    grey_counts = np.zeros(len(guess_ids), dtype=np.int64)
+    entropies = np.zeros(len(guess_ids))
+
+    for b, board in enumerate(boards):
+        board_counts = counts[:, b]
+        grey_counts += board_counts @ GREY_COUNTS
+        total = max(len(board), 1)
+        probabilities = board_counts / total
+        with np.errstate(divide="ignore", invalid="ignore"):
+            entropies += -np.where(board_counts > 0, probabilities * np.log2(probabilities), 0.0).sum(axis=1)
+
+        if not bucket_codes[b]:
+            continue
+
+        board_counts[:, SOLVED_CODE] = 0
+        bucket_sizes = board_counts[:, np.asarray(bucket_codes[b], dtype=np.int64)]
+        avg_num_words = bucket_sizes.sum(axis=1) / len(bucket_codes[b])
+        squares = _squared_differences(bucket_sizes, avg_num_words)
+        std_devs += np.cumsum(squares, axis=1)[:, -1]
+
+    return GuessScores(std_devs, grey_counts, entropies)
@@ -0,0 +1,243 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+from wordle_heuristic import all_words, best_next_guess_max_info, best_next_guess_std_dev, get_feedback_string, solution_words
+from wordle_index import get_word_index
+
+NEXT_GUESS = {
+    "std_dev": best_next_guess_std_dev,
+    "max_info": best_next_guess_max_info,
+}
+
+# Word list of each worker process, set up once by _init_worker
+_worker = {}
+
+def _init_worker(word_list: List[str]) -> None:
+    _worker["word_list"] = word_list
+
+def _solve(guesses: List[str], feedbacks: List[str], strategy: str) -> str:
+    return NEXT_GUESS[strategy](guesses, feedbacks, _worker["word_list"])
+
+"""
+Request counts and latencies of a service. Latencies are kept for the most
+recent max_samples requests
+"""
+class ServiceMetrics:
+    def __init__(self, max_samples: int = 100000):
+        self.requests = 0
+        self.hits = 0
+        self.coalesced = 0
+        self.latencies = deque(maxlen=max_samples)
+
+    def record(self, seconds: float) -> None:
+        self.requests = self.requests + 1
+        self.latencies.append(seconds)
+
+    def percentile(self, p: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+    """
+    Summary of the metrics. Requests answered from the cache count as hits,
+    and requests that waited on an identical request already being computed
+    count as coalesced
+    """
+    def summary(self) -> dict:
+        return {
+            "requests": self.requests,
+            "hit_rate": self.hits / self.requests if self.requests else 0.0,
+            "coalesced_rate": self.coalesced / self.requests if self.requests else 0.0,
+            "p50_ms": self.percentile(50) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+        }
+
+"""
+Next guess suggestions for many concurrent games. Each request is reduced to a
+canonical state: the set of remaining candidates, the green positions of the
+last feedback and whether it had a grey, which is everything the strategies
+look at. Different guess orders that leave the same candidates therefore share
+one answer. Answers are kept in an LRU cache, identical requests that arrive
+while one is being computed wait on that computation, and the scoring itself
+runs in a process pool so it doesn't hold up the event loop
+"""
+class SolverService:
+    def __init__(self, word_list: List[str] = all_words, processes: int = None, cache_size: int = 100000):
+        self.word_list = word_list
+        self.index = get_word_index(word_list)
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.in_flight: Dict[tuple, asyncio.Future] = {}
+        self.metrics = ServiceMetrics()
+        self.executor = ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(word_list,))
+
+    def canonical_state(self, guesses: List[str], feedbacks: List[str], strategy: str) -> tuple:
+        candidates = self.index.filter(guesses, feedbacks)
+        last_feedback = feedbacks[-1] if feedbacks else ""
+        greens = tuple(c == '1' for c in last_feedback)
+        return (strategy, candidates, greens, '3' in last_feedback)
+
+    """
+    Compute the answer for a state in the process pool and cache it. Runs as
+    a task of its own, so it carries on for the other requests waiting on it
+    if the one that started it goes away
+    """
+    async def _compute(self, key: tuple, guesses: List[str], feedbacks: List[str], strategy: str) -> str:
+        try:
+            guess = await asyncio.get_running_loop().run_in_executor(self.executor, _solve, guesses, feedbacks, strategy)
+        finally:
+            del self.in_flight[key]
+
+        self.cache[key] = guess
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return guess
+
+    async def next_guess(self, guesses: List[str], feedbacks: List[str], strategy: str = "std_dev") -> str:
+        if strategy not in NEXT_GUESS:
+            raise ValueError("Unknown strategy " + str(strategy))
+        if not feedbacks or len(guesses) != len(feedbacks):
+            raise ValueError("Every guess needs its feedback, and there must be at least one")
+
+        start = time.perf_counter()
+        key = self.canonical_state(guesses, feedbacks, strategy)
+
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.metrics.hits = self.metrics.hits + 1
+            guess = self.cache[key]
+        else:
+            if key in self.in_flight:
+                self.metrics.coalesced = self.metrics.coalesced + 1
+            else:
+                self.in_flight[key] = asyncio.ensure_future(self._compute(key, guesses, feedbacks, strategy))
+            # Cancelling one request must not cancel the others sharing it
+            guess = await asyncio.shield(self.in_flight[key])
+
+        self.metrics.record(time.perf_counter() - start)
+        return guess
+
+    def close(self) -> None:
+        self.executor.shutdown()
+
+async def _respond(service: SolverService, line: bytes) -> dict:
+    request = json.loads(line)
+    if request.get("metrics"):
+        return service.metrics.summary()
+    return {"guess": await service.next_guess(request["guesses"], request["feedbacks"], request.get("strategy", "std_dev"))}
+
+"""
+Serve a service over TCP. Every request is one line of JSON, either
+{"guesses": [...], "feedbacks": [...], "strategy": "std_dev"} which is answered
+with {"guess": ...}, or {"metrics": true} which is answered with the metrics.
+A request that can't be answered gets {"error": ...} and the connection stays
+open
+"""
+async def serve(service: SolverService, host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+
+                try:
+                    response = await _respond(service, line)
+                except Exception as error:
+                    response = {"error": type(error).__name__ + ": " + str(error)}
+
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+        except asyncio.CancelledError:
+            # The server is shutting down
+            pass
+        except ConnectionError:
+            # The client went away
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+async def _request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, request: dict) -> dict:
+    writer.write((json.dumps(request) + "\n").encode())
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+"""
+Load test a running service: each player connects and plays games from the
+starting word against random solutions, asking the service for every guess.
+Returns the number of requests per second along with the service's metrics
+"""
+async def load_test(host: str = "127.0.0.1", port: int = 8765, players: int = 50, games: int = 10, starting_word: str = "raise", solutions: List[str] = solution_words, strategy: str = "std_dev", seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    games_by_player = [[rng.choice(solutions) for _ in range(games)] for _ in range(players)]
+
+    async def player(player_solutions: List[str]) -> int:
+        reader, writer = await asyncio.open_connection(host, port)
+        requests = 0
+        for solution in player_solutions:
+            guesses = [starting_word]
+            feedbacks = [get_feedback_string(starting_word, solution)]
+            while guesses[-1] != solution:
+                response = await _request(reader, writer, {"guesses": guesses, "feedbacks": feedbacks, "strategy": strategy})
+                requests = requests + 1
+                guesses.append(response["guess"])
+                feedbacks.append(get_feedback_string(response["guess"], solution))
+
+        writer.close()
+        await writer.wait_closed()
+        return requests
+
+    start = time.perf_counter()
+    counts = await asyncio.gather(*(player(s) for s in games_by_player))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    metrics = await _request(reader, writer, {"metrics": True})
+    writer.close()
+    await writer.wait_closed()
+
+    metrics["requests_per_second"] = sum(counts) / elapsed
+    return metrics
+
+async def _main(args: argparse.Namespace) -> None:
+    words = solution_words if args.solutions_only else all_words
+    if args.mode == "load-test":
+        print(json.dumps(await load_test(args.host, args.port, args.players, args.games, args.starting_word, solution_words, args.strategy), indent=4))
+        return
+
+    service = SolverService(words, args.processes, args.cache_size)
+    server = await serve(service, args.host, args.port)
+    try:
+        if args.mode == "serve":
+            print("Serving on " + args.host + ":" + str(args.port))
+            await server.serve_forever()
+        else:
+            print(json.dumps(await load_test(args.host, args.port, args.players, args.games, args.starting_word, solution_words, args.strategy), indent=4))
+    finally:
+        server.close()
+        await server.wait_closed()
+        service.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Next guess service with request coalescing and a state cache")
+    parser.add_argument("mode", choices=["serve", "load-test", "demo"], help="run the service, load test a running one, or both in one process")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--solutions-only", action="store_true", help="use solution_words instead of all_words")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--cache-size", type=int, default=100000)
+    parser.add_argument("--strategy", choices=list(NEXT_GUESS), default="std_dev")
+    parser.add_argument("--players", type=int, default=50)
+    parser.add_argument("--games", type=int, default=10, help="games per player in the load test")
+    parser.add_argument("--starting-word", default="raise")
+    args = parser.parse_args()
+
+    asyncio.run(_main(args))
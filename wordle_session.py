@@ -0,0 +1,171 @@
+import numpy as np
+from typing import List
+from wordle_feedback import FEEDBACK_STRINGS, GREY_COUNTS, FeedbackMatrix, encode_feedback, get_feedback_matrix
+from wordle_scoring import GuessScores, bucket_codes_after, score_guesses
+from wordle_trace import tracer
+
+"""
+One point in a game: the ids of the words that are still possible solutions,
+plus the last guess (as packed letters, since a guess doesn't need to be in the
+word list), the feedback code it got and the state before it. States are never
+modified, so applying a guess just links a new state onto the old one and
+stepping back a turn is following previous
+"""
+class GameState:
+    __slots__ = ("candidate_ids", "guess_letters", "code", "previous")
+
+    def __init__(self, candidate_ids: np.ndarray, guess_letters: np.ndarray = None, code: int = None, previous: 'GameState' = None):
+        self.candidate_ids = candidate_ids
+        self.guess_letters = guess_letters
+        self.code = code
+        self.previous = previous
+
+    """
+    Packed letters and feedback code of every guess so far, oldest first
+    """
+    def moves(self) -> List[tuple]:
+        result = []
+        state = self
+        while state.previous is not None:
+            result.append((state.guess_letters, state.code))
+            state = state.previous
+        result.reverse()
+        return result
+
+"""
+State of one game in progress. Holds the ids of the words that are still
+possible solutions and narrows them as feedback comes in, so each turn only
+looks at the words that survived the previous one. Use fork() to branch off a
+copy and undo() to step back a turn. The first two moves come from the
+strategy's opening book if one has been built, unless use_book is False
+"""
+class SolverSession:
+    def __init__(self, word_list: List[str], guesses: List[str] = [], feedbacks: List[str] = [], matrix: FeedbackMatrix = None, use_book: bool = True):
+        self.word_list = word_list
+        self.matrix = matrix if matrix is not None else get_feedback_matrix(word_list)
+        self.state = GameState(np.arange(len(word_list), dtype=np.int64))
+        # Opening book of each strategy (None if it hasn't been built), looked
+        # up the first time it is needed and shared with forks
+        self.books = {} if use_book else None
+
+        for i in range(len(guesses)):
+            self.apply(guesses[i], feedbacks[i])
+
+    @property
+    def candidate_ids(self) -> np.ndarray:
+        return self.state.candidate_ids
+
+    @property
+    def guesses(self) -> List[str]:
+        return [bytes(letters + ord('a')).decode("ascii") for letters, _ in self.state.moves()]
+
+    @property
+    def feedbacks(self) -> List[str]:
+        return [FEEDBACK_STRINGS[code] for _, code in self.state.moves()]
+
+    """
+    Narrow the candidates to the words that would have given this feedback.
+    Same result as re-filtering the word list with possible_next_guesses
+    """
+    def apply(self, guess: str, feedback: str) -> None:
+        if guess in self.matrix.index:
+            self.apply_id(self.matrix.index[guess], encode_feedback(feedback))
+            return
+
+        letters = self.matrix.packed.letters_of(guess)
+        code = encode_feedback(feedback)
+        tracer.count("feedback_evaluations", len(self.candidate_ids))
+        with tracer.phase("filter"):
+            keep = self.matrix.letters_row(letters, self.candidate_ids) == code
+
+        self.state = GameState(self.candidate_ids[keep], letters, code, self.state)
+
+    """
+    apply() for a guess id and feedback code, without going through strings
+    """
+    def apply_id(self, guess_id: int, code: int) -> None:
+        candidate_ids = self.candidate_ids
+        tracer.count("feedback_evaluations", len(candidate_ids))
+        with tracer.phase("filter"):
+            keep = self.matrix.row(guess_id, candidate_ids) == code
+            # A word that has already been guessed is never a candidate
+            keep &= candidate_ids != guess_id
+
+        self.state = GameState(candidate_ids[keep], self.matrix.letters[guess_id], code, self.state)
+
+    """
+    Step back to the state before the last applied guess
+    """
+    def undo(self) -> None:
+        self.state = self.state.previous
+
+    """
+    Independent copy of this session. States are never modified, so the copy
+    shares them
+    """
+    def fork(self) -> 'SolverSession':
+        other = SolverSession.__new__(SolverSession)
+        other.word_list = self.word_list
+        other.matrix = self.matrix
+        other.state = self.state
+        other.books = self.books
+        return other
+
+    def last_feedback(self) -> str:
+        return FEEDBACK_STRINGS[self.state.code] if self.state.code is not None else None
+
+    def candidates(self) -> List[str]:
+        return [self.word_list[i] for i in self.candidate_ids.tolist()]
+
+    """
+    Score every remaining candidate as the next guess
+    """
+    def scores(self) -> GuessScores:
+        tracer.count("words_scored", len(self.candidate_ids))
+        tracer.count("feedback_evaluations", len(self.candidate_ids) ** 2)
+        with tracer.phase("scoring"):
+            return score_guesses(self.matrix, self.candidate_ids, self.candidate_ids, bucket_codes_after(self.last_feedback()))
+
+    """
+    The strategy's opening book guess for a game in its first two moves, or
+    None if there is no book or it doesn't cover the game
+    """
+    def book_guess(self, strategy: str) -> str:
+        if self.books is None or not 1 <= len(self.state.moves()) <= 2:
+            return None
+
+        if strategy not in self.books:
+            # wordle_book builds its books from these strategies
+            from wordle_book import get_opening_book
+            self.books[strategy] = get_opening_book(self.word_list, strategy)
+
+        book = self.books[strategy]
+        return book.lookup(self.guesses, self.feedbacks) if book is not None else None
+
+    def best_next_guess_std_dev(self) -> str:
+        book_guess = self.book_guess("std_dev")
+        if book_guess is not None:
+            return book_guess
+
+        scores = self.scores()
+        return self.word_list[int(self.candidate_ids[np.argmin(scores.std_devs)])]
+
+    def best_next_guess_max_info(self) -> str:
+        book_guess = self.book_guess("max_info")
+        if book_guess is not None:
+            return book_guess
+
+        if self.state.code is not None and GREY_COUNTS[self.state.code] == 0:
+            return self.best_next_guess_std_dev()
+
+        if len(self.candidate_ids) == 0:
+            return ""
+
+        scores = self.scores()
+        return self.word_list[int(self.candidate_ids[np.argmin(scores.grey_counts)])]
+
+# Named strategies: the SolverSession method that picks the next guess
+STRATEGIES = {
+    "std_dev": SolverSession.best_next_guess_std_dev,
+    "max_info": SolverSession.best_next_guess_max_info,
+}
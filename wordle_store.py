@@ -0,0 +1,97 @@
+import os
+import struct
+from os.path import exists
+from typing import Dict, Tuple
+
+MAGIC = b"WSCR"
+HEADER = struct.Struct("<4sI")
+RECORD = struct.Struct("<Id")
+# A record with this id marks the sweep as finished
+COMPLETE_ID = 0xFFFFFFFF
+
+"""
+Append-only file of (word id, score) records for a sweep over a word list.
+Every scored word is appended as a fixed-size record, and a final marker record
+is written once every word has been scored. A sweep that is interrupted part
+way through keeps all of its complete records and can carry on from there.
+Open a store someone else may be writing with repair=False: it is then only
+read, and left exactly as it is on disk
+"""
+class ScoreStore:
+    def __init__(self, file_name: str, num_words: int, repair: bool = True):
+        self.file_name = file_name
+        self.num_words = num_words
+        self.repair = repair
+        self.scores, self.complete = self._read()
+        self._file = None
+
+    """
+    Read back every complete record. A partly written trailing record, or a
+    file written for a different number of words, is ignored, and discarded
+    from disk if repair is set
+    """
+    def _read(self) -> Tuple[Dict[int, float], bool]:
+        scores = {}
+        if not exists(self.file_name):
+            return scores, False
+
+        with open(self.file_name, "rb") as file:
+            data = file.read()
+
+        if len(data) < HEADER.size or HEADER.unpack_from(data) != (MAGIC, self.num_words):
+            if self.repair:
+                os.remove(self.file_name)
+            return scores, False
+
+        end = HEADER.size + (len(data) - HEADER.size) // RECORD.size * RECORD.size
+        for word_id, score in RECORD.iter_unpack(data[HEADER.size:end]):
+            if word_id == COMPLETE_ID:
+                return scores, True
+            scores[word_id] = score
+
+        # Drop any partial record so new records line up
+        if end != len(data) and self.repair:
+            with open(self.file_name, "r+b") as file:
+                file.truncate(end)
+
+        return scores, False
+
+    def _open(self):
+        if self._file is None:
+            if not exists(self.file_name):
+                # Write the header to a temporary file and move it into place,
+                # so the file never exists without its header
+                temp_file = self.file_name + "." + str(os.getpid()) + ".tmp"
+                with open(temp_file, "wb") as file:
+                    file.write(HEADER.pack(MAGIC, self.num_words))
+                os.replace(temp_file, self.file_name)
+            self._file = open(self.file_name, "ab")
+
+        return self._file
+
+    """
+    Append the scores for a batch of words and flush them to disk
+    """
+    def append(self, scores: Dict[int, float]) -> None:
+        file = self._open()
+        file.write(b"".join(RECORD.pack(word_id, score) for word_id, score in scores.items()))
+        file.flush()
+        self.scores.update(scores)
+
+    """
+    Close the file without marking the sweep finished
+    """
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    """
+    Write the completion marker and close the file
+    """
+    def finish(self) -> None:
+        file = self._open()
+        file.write(RECORD.pack(COMPLETE_ID, float(len(self.scores))))
+        file.close()
+        self._file = None
+        self.complete = True
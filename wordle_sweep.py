@@ -0,0 +1,226 @@
+import argparse
+import json
+import os
+import socket
+import time
+from multiprocessing import Process
+from os.path import exists, getmtime, join
+from typing import Callable, Dict, List
+import numpy as np
+from wordle_cache import default_cache
+from wordle_feedback import NUM_FEEDBACKS, FeedbackMatrix, get_feedback_matrix
+from wordle_heuristic import all_words, find_n_smallest, solution_words
+from wordle_scoring import bucket_codes_after, bucket_counts, score_guesses
+from wordle_store import ScoreStore
+
+# A claim whose lock file hasn't been touched for this many seconds is taken to
+# belong to a worker that died, and its shard is handed to someone else
+DEFAULT_STALE_AFTER = 600
+
+def _score_std_dev(matrix: FeedbackMatrix, guess_ids: np.ndarray, solution_ids: np.ndarray) -> np.ndarray:
+    return score_guesses(matrix, guess_ids, solution_ids, bucket_codes_after()).std_devs
+
+def _score_max_info(matrix: FeedbackMatrix, guess_ids: np.ndarray, solution_ids: np.ndarray) -> np.ndarray:
+    return bucket_counts(matrix, guess_ids, solution_ids)[:, NUM_FEEDBACKS - 1]
+
+# Starting word scores that can be swept: scorer for a batch of guess ids
+# against every word, and the store kind best_dividing_word_* keep them under
+SWEEPS: Dict[str, Callable[[FeedbackMatrix, np.ndarray, np.ndarray], np.ndarray]] = {
+    "std_dev": _score_std_dev,
+    "max_info": _score_max_info,
+}
+SWEEP_STORE_KINDS = {
+    "std_dev": "std_dev_scores",
+    "max_info": "max_info_scores",
+}
+
+"""
+Directory a sweep coordinates through: one lock file and one partial score
+file per shard. Give every worker the same directory on a shared filesystem
+to spread a sweep over several machines. By default it lives in the artifact
+cache, keyed by the word list, the kind of sweep and the shard size
+"""
+def sweep_dir_for(word_list: List[str], kind: str, shard_size: int) -> str:
+    return default_cache.path(word_list, "sweep", {"kind": kind, "shard_size": shard_size})
+
+def _num_shards(word_list: List[str], shard_size: int) -> int:
+    return (len(word_list) + shard_size - 1) // shard_size
+
+def _lock_file(sweep_dir: str, shard: int) -> str:
+    return join(sweep_dir, "shard_" + str(shard) + ".lock")
+
+def _store_file(sweep_dir: str, shard: int) -> str:
+    return join(sweep_dir, "shard_" + str(shard) + ".scores")
+
+"""
+Try to claim a shard by creating its lock file, which only one worker can do.
+A lock that has gone stale is first moved out of the way under a name unique
+to this worker, so when several workers notice the same stale lock only one of
+them gets to replace it
+"""
+def _claim(sweep_dir: str, shard: int, owner: str, stale_after: float) -> bool:
+    lock_file = _lock_file(sweep_dir, shard)
+    stale_file = lock_file + "." + owner + ".stale"
+    try:
+        if time.time() - getmtime(lock_file) > stale_after:
+            os.rename(lock_file, stale_file)
+            # If another worker replaced the stale lock in the meantime we have
+            # just moved its fresh claim, so put that back
+            if time.time() - getmtime(stale_file) <= stale_after:
+                try:
+                    os.link(stale_file, lock_file)
+                except FileExistsError:
+                    pass
+            os.remove(stale_file)
+    except OSError:
+        # No lock, or another worker took it over first
+        pass
+
+    try:
+        fd = os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+
+    with os.fdopen(fd, "w") as file:
+        file.write(owner)
+    return True
+
+"""
+Whether the shard's lock still names this worker. A worker that stalled for
+longer than stale_after may have had its shard taken over, and must then leave
+both the shard and the lock to the new owner
+"""
+def _holds_claim(sweep_dir: str, shard: int, owner: str) -> bool:
+    try:
+        with open(_lock_file(sweep_dir, shard)) as file:
+            return file.read() == owner
+    except OSError:
+        return False
+
+"""
+Whether a shard is finished. Its owner may still be writing it, so the score
+file is only read
+"""
+def _shard_complete(word_list: List[str], sweep_dir: str, shard: int) -> bool:
+    return exists(_store_file(sweep_dir, shard)) and ScoreStore(_store_file(sweep_dir, shard), len(word_list), repair=False).complete
+
+"""
+Work through a sweep as one worker. Shards that aren't finished or claimed by
+a live worker are claimed one at a time and scored in batches into the shard's
+partial score file, touching the lock after every batch to show the worker is
+still alive. The claim is checked again before every write, and a shard whose
+claim was taken over is dropped. A shard left half done by a worker that died
+carries on from its last batch. Workers can start and stop at any time.
+Returns the number of shards this worker finished
+"""
+def run_worker(word_list: List[str], kind: str = "std_dev", sweep_dir: str = None, shard_size: int = 256, batch_size: int = 64, stale_after: float = DEFAULT_STALE_AFTER) -> int:
+    if sweep_dir is None:
+        sweep_dir = sweep_dir_for(word_list, kind, shard_size)
+    os.makedirs(sweep_dir, exist_ok=True)
+
+    score_batch = SWEEPS[kind]
+    matrix = get_feedback_matrix(word_list)
+    solution_ids = np.arange(len(word_list))
+    owner = socket.gethostname() + "-" + str(os.getpid())
+
+    finished = 0
+    for shard in range(_num_shards(word_list, shard_size)):
+        if _shard_complete(word_list, sweep_dir, shard) or not _claim(sweep_dir, shard, owner, stale_after):
+            continue
+
+        # Another worker may have finished it between the check and the claim.
+        # Holding the claim, this worker is the only one that repairs the file
+        store = ScoreStore(_store_file(sweep_dir, shard), len(word_list))
+        if not store.complete:
+            start = shard * shard_size
+            end = min(start + shard_size, len(word_list))
+            remaining = np.array([i for i in range(start, end) if i not in store.scores], dtype=np.int64)
+            claimed = True
+            for batch_start in range(0, len(remaining), batch_size):
+                batch = remaining[batch_start:batch_start + batch_size]
+                scores = dict(zip(batch.tolist(), score_batch(matrix, batch, solution_ids).tolist()))
+                claimed = _holds_claim(sweep_dir, shard, owner)
+                if not claimed:
+                    break
+                store.append(scores)
+                os.utime(_lock_file(sweep_dir, shard))
+
+            if not claimed or not _holds_claim(sweep_dir, shard, owner):
+                store.close()
+                print(owner + " lost its claim on shard " + str(shard))
+                continue
+
+            store.finish()
+            finished = finished + 1
+            print(owner + " finished shard " + str(shard))
+
+        if _holds_claim(sweep_dir, shard, owner):
+            os.remove(_lock_file(sweep_dir, shard))
+
+    return finished
+
+"""
+Combine the partial score files of a finished sweep. The scores are also saved
+as the store best_dividing_word_std_dev / best_dividing_word_max_info read, so
+those return straight away afterwards. Returns the n best words in the same
+form as they do, or raises if some shards aren't finished yet
+"""
+def merge_sweep(word_list: List[str], kind: str = "std_dev", sweep_dir: str = None, shard_size: int = 256, num_results: int = 1) -> dict:
+    if sweep_dir is None:
+        sweep_dir = sweep_dir_for(word_list, kind, shard_size)
+
+    scores = {}
+    missing = []
+    for shard in range(_num_shards(word_list, shard_size)):
+        store = ScoreStore(_store_file(sweep_dir, shard), len(word_list), repair=False)
+        if not store.complete:
+            missing.append(shard)
+        scores.update(store.scores)
+
+    if missing:
+        raise RuntimeError("Sweep is missing " + str(len(missing)) + " shards: " + str(missing))
+
+    store_file = default_cache.path(word_list, SWEEP_STORE_KINDS[kind], extension=".scores")
+    store = ScoreStore(store_file, len(word_list))
+    if not store.complete:
+        store.append({i: scores[i] for i in range(len(word_list)) if i not in store.scores})
+        store.finish()
+        default_cache.commit(store_file)
+
+    results = {word_list[i]: scores[i] for i in range(len(word_list))}
+    if kind == "max_info":
+        results = {word: int(score) for word, score in results.items()}
+    return find_n_smallest(results, num_results)
+
+"""
+Run a sweep on this machine with a number of worker processes standing in for
+separate nodes, then merge it
+"""
+def run_local(word_list: List[str], kind: str = "std_dev", processes: int = 2, sweep_dir: str = None, shard_size: int = 256, num_results: int = 1) -> dict:
+    workers = [Process(target=run_worker, args=(word_list, kind, sweep_dir, shard_size)) for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    return merge_sweep(word_list, kind, sweep_dir, shard_size, num_results)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Sharded starting word sweep coordinated through lock files")
+    parser.add_argument("mode", choices=["worker", "merge", "local"], help="score shards as one worker, merge the finished shards, or do both with local processes")
+    parser.add_argument("--kind", choices=list(SWEEPS), default="std_dev")
+    parser.add_argument("--solutions-only", action="store_true", help="use solution_words instead of all_words")
+    parser.add_argument("--sweep-dir", default=None, help="shared directory to coordinate through (default: in the artifact cache)")
+    parser.add_argument("--shard-size", type=int, default=256)
+    parser.add_argument("--processes", type=int, default=2, help="worker processes for local mode")
+    parser.add_argument("--stale-after", type=float, default=DEFAULT_STALE_AFTER, help="seconds before an untouched claim is taken over")
+    parser.add_argument("-n", "--num-results", type=int, default=5)
+    args = parser.parse_args()
+
+    words = solution_words if args.solutions_only else all_words
+    if args.mode == "worker":
+        print(str(run_worker(words, args.kind, args.sweep_dir, args.shard_size, stale_after=args.stale_after)) + " shards finished")
+    elif args.mode == "merge":
+        print(json.dumps(merge_sweep(words, args.kind, args.sweep_dir, args.shard_size, args.num_results)))
+    else:
+        print(json.dumps(run_local(words, args.kind, args.processes, args.sweep_dir, args.shard_size, args.num_results)))
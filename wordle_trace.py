@@ -0,0 +1,133 @@
+import json
+import time
+from os.path import splitext
+from typing import List
+
+"""
+Times a phase of the solver while tracing is enabled
+"""
+class _PhaseTimer:
+    def __init__(self, tracer: 'Tracer', name: str):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.tracer._add(self.tracer.timers, self.name, time.perf_counter() - self.start)
+
+"""
+Stands in for _PhaseTimer while tracing is disabled
+"""
+class _NullTimer:
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        pass
+
+_NULL_TIMER = _NullTimer()
+
+"""
+Per-phase timers and counters for solver runs. Disabled by default, in which
+case every call returns straight away. Once enabled, each game played between
+start_game and end_game is written as one JSON line with its path, the time
+spent in each phase, its counters and the number of candidates left on each
+turn. disable() writes a summary with a histogram of path lengths, the totals
+for every phase and counter, and the slowest games
+"""
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self._file = None
+        self.file_name = None
+
+    def enable(self, file_name: str) -> None:
+        self.file_name = file_name
+        self._file = open(file_name, "w")
+        self.timers = {}
+        self.counters = {}
+        self.candidates = []
+        self.total_timers = {}
+        self.total_counters = {}
+        self.lengths = {}
+        self.games = []
+        self.enabled = True
+
+    """
+    Time the code in a with block under the given phase name
+    """
+    def phase(self, name: str):
+        return _PhaseTimer(self, name) if self.enabled else _NULL_TIMER
+
+    def count(self, name: str, n: int = 1) -> None:
+        if self.enabled:
+            self._add(self.counters, name, n)
+
+    """
+    Record how many candidates are left at the start of a turn
+    """
+    def turn(self, num_candidates: int) -> None:
+        if self.enabled:
+            self.candidates.append(num_candidates)
+
+    def start_game(self) -> None:
+        if self.enabled:
+            self.timers = {}
+            self.counters = {}
+            self.candidates = []
+            self.game_start = time.perf_counter()
+
+    def end_game(self, path: List[str]) -> None:
+        if not self.enabled:
+            return
+
+        record = {
+            "starting_word": path[0],
+            "solution": path[-1],
+            "path": path,
+            "length": len(path),
+            "seconds": time.perf_counter() - self.game_start,
+            "phases": self.timers,
+            "counters": self.counters,
+            "candidates": self.candidates,
+        }
+        self._file.write(json.dumps(record) + "\n")
+
+        for name, value in self.timers.items():
+            self._add(self.total_timers, name, value)
+        for name, value in self.counters.items():
+            self._add(self.total_counters, name, value)
+        self._add(self.lengths, len(path), 1)
+        self.games.append((record["seconds"], path[0], path[-1]))
+
+    """
+    Stop tracing and write the summary next to the trace, returning it
+    """
+    def disable(self, num_slowest: int = 10) -> dict:
+        if not self.enabled:
+            return {}
+
+        self.games.sort(reverse=True)
+        summary = {
+            "games": len(self.games),
+            "length_histogram": {length: self.lengths[length] for length in sorted(self.lengths)},
+            "phases": self.total_timers,
+            "counters": self.total_counters,
+            "slowest_games": [{"seconds": seconds, "starting_word": start, "solution": solution} for seconds, start, solution in self.games[:num_slowest]],
+        }
+
+        self._file.close()
+        with open(splitext(self.file_name)[0] + ".summary.json", "w") as outfile:
+            json.dump(summary, outfile, indent=4)
+
+        self.enabled = False
+        return summary
+
+    @staticmethod
+    def _add(data: dict, key, value) -> None:
+        data[key] = data.get(key, 0) + value
+
+# Shared by the whole solver, so enabling it here turns on every trace point
+tracer = Tracer()
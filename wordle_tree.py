@@ -0,0 +1,145 @@
+import numpy as np
+import sys
+from typing import Dict, List
+from wordle_feedback import FEEDBACK_STRINGS, SOLVED_CODE, encode_feedback, get_feedback_matrix
+from wordle_heuristic import all_words, solution_words
+from wordle_session import STRATEGIES, SolverSession
+
+"""
+The complete decision tree of a deterministic strategy from a fixed starting
+word. Node i guesses words[guesses[i]], and its children for each feedback code
+are child_codes/child_nodes[child_starts[i]:child_starts[i+1]]. Node 0 is the
+starting word, which doesn't have to be in the word list (its guess id is then
+len(words)). Every node stands for a different set of remaining candidates
+"""
+class StrategyTree:
+    def __init__(self, words: List[str], starting_word: str, guesses: np.ndarray, child_starts: np.ndarray, child_codes: np.ndarray, child_nodes: np.ndarray):
+        self.words = words
+        self.starting_word = starting_word
+        self.guesses = guesses
+        self.child_starts = child_starts
+        self.child_codes = child_codes
+        self.child_nodes = child_nodes
+
+    def guess(self, node: int) -> str:
+        guess_id = int(self.guesses[node])
+        return self.words[guess_id] if guess_id < len(self.words) else self.starting_word
+
+    def child(self, node: int, code: int) -> int:
+        start = self.child_starts[node]
+        end = self.child_starts[node + 1]
+        match = np.flatnonzero(self.child_codes[start:end] == code)
+        return int(self.child_nodes[start + match[0]]) if len(match) else -1
+
+    """
+    The strategy's next guess after the given guesses and feedbacks, or None if
+    the game has left the tree (the guesses didn't follow the strategy)
+    """
+    def next_guess(self, guesses: List[str], feedbacks: List[str]) -> str:
+        node = 0
+        for i in range(len(guesses)):
+            if self.guess(node) != guesses[i]:
+                return None
+            node = self.child(node, encode_feedback(feedbacks[i]))
+            if node < 0:
+                return None
+
+        return self.guess(node)
+
+    """
+    Path of guesses the strategy takes to find solution
+    """
+    def path(self, solution: str) -> List[str]:
+        matrix = get_feedback_matrix(self.words)
+        solution_id = [matrix.index[solution]]
+        node = 0
+        result = [self.guess(node)]
+        while result[-1] != solution:
+            node = self.child(node, int(matrix.guess_row(result[-1], solution_id)[0]))
+            result.append(self.guess(node))
+
+        return result
+
+    """
+    Number of guesses needed for every word in the word list, found with a
+    single walk over the tree
+    """
+    def path_lengths(self) -> Dict[str, int]:
+        matrix = get_feedback_matrix(self.words)
+        lengths = {}
+
+        def walk(node: int, candidate_ids: np.ndarray, depth: int):
+            guess_id = int(self.guesses[node])
+            codes = matrix.guess_row(self.guess(node), candidate_ids)
+            for i in range(self.child_starts[node], self.child_starts[node + 1]):
+                walk(int(self.child_nodes[i]), candidate_ids[codes == self.child_codes[i]], depth + 1)
+
+            if np.any(candidate_ids == guess_id):
+                lengths[self.words[guess_id]] = depth
+
+        walk(0, np.arange(len(self.words), dtype=np.int64), 1)
+        return lengths
+
+    """
+    Path lengths in the same format as tester_std_dev / tester_max_info
+    """
+    def length_counts(self) -> dict:
+        lengths = self.path_lengths()
+        counts = {}
+        for word in self.words:
+            if lengths[word] in counts:
+                counts[lengths[word]].append(word)
+            else:
+                counts[lengths[word]] = [word]
+
+        return counts
+
+    def save(self, file_name: str) -> None:
+        np.savez_compressed(file_name, words=np.array(self.words, dtype="S5"), starting_word=np.array(self.starting_word, dtype="S5"), guesses=self.guesses, child_starts=self.child_starts, child_codes=self.child_codes, child_nodes=self.child_nodes)
+
+    @staticmethod
+    def load(file_name: str) -> 'StrategyTree':
+        with np.load(file_name) as data:
+            words = [word.decode("ascii") for word in data["words"].tolist()]
+            return StrategyTree(words, data["starting_word"].item().decode("ascii"), data["guesses"], data["child_starts"], data["child_codes"], data["child_nodes"])
+
+"""
+Build the complete decision tree for a strategy from a starting word. Each
+feedback splits the candidates into disjoint sets, so no two states in the tree
+are the same and every node is compiled exactly once
+"""
+def compile_strategy_tree(starting_word: str, word_list: List[str] = all_words, strategy: str = "std_dev") -> StrategyTree:
+    next_guess = STRATEGIES[strategy]
+    matrix = get_feedback_matrix(word_list)
+    guesses = []
+    children = []
+
+    def compile_node(session: SolverSession, guess: str) -> int:
+        node = len(guesses)
+        guesses.append(matrix.index.get(guess, len(word_list)))
+        children.append([])
+
+        codes = matrix.guess_row(guess, session.candidate_ids)
+        for code in np.unique(codes).tolist():
+            if code == SOLVED_CODE:
+                continue
+
+            session.apply(guess, FEEDBACK_STRINGS[code])
+            children[node].append((code, compile_node(session, next_guess(session))))
+            session.undo()
+
+        return node
+
+    compile_node(SolverSession(word_list, matrix=matrix), starting_word)
+
+    child_starts = np.zeros(len(guesses) + 1, dtype=np.int32)
+    child_starts[1:] = np.cumsum([len(c) for c in children])
+    child_codes = np.array([code for c in children for code, _ in c], dtype=np.uint8)
+    child_nodes = np.array([child for c in children for _, child in c], dtype=np.int32)
+    return StrategyTree(word_list, starting_word, np.array(guesses, dtype=np.int32), child_starts, child_codes, child_nodes)
+
+if __name__ == '__main__':
+    starting_word = sys.argv[1] if len(sys.argv) > 1 else "raise"
+    tree = compile_strategy_tree(starting_word, solution_words)
+    tree.save("strategy_tree_" + starting_word + ".npz")
+    print(tree.length_counts())
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import struct
+from functools import lru_cache
+from os.path import abspath, dirname, exists, join
+from typing import List
+
+WORD_LENGTH = 5
+
+# Data files live next to the code, so the solver works from any directory
+PACKAGE_DIR = dirname(abspath(__file__))
+WORD_FILE = join(PACKAGE_DIR, "words.bin")
+WORD_LISTS = ["all_words", "solution_words"]
+
+MAGIC = b"WWR2"
+HEADER = struct.Struct("<4sI")
+# Name, digest of the JSON file the list was built from, number of words
+LIST_HEADER = struct.Struct("<16s16sI")
+
+def _mask_bytes(num_words: int) -> int:
+    return (num_words + 7) // 8
+
+"""
+Masks of the words with each letter in each position, the tables WordIndex is
+built from. positions[j][letter] has bit i set if word_list[i][j] is that letter
+"""
+def letter_position_masks(word_list: List[str]) -> List[List[int]]:
+    bits = [[["0"] * len(word_list) for _ in range(26)] for _ in range(WORD_LENGTH)]
+    for i, word in enumerate(word_list):
+        for j in range(WORD_LENGTH):
+            bits[j][ord(word[j]) - ord('a')][i] = "1"
+
+    # Bit i is the i-th digit from the right
+    return [[int("".join(reversed(letter_bits)) or "0", 2) for letter_bits in position_bits] for position_bits in bits]
+
+def _json_file(name: str) -> str:
+    return join(PACKAGE_DIR, name + ".json")
+
+"""
+Digest of a word list's JSON file, which the word file keeps to tell whether
+the list has been edited since it was built
+"""
+def _json_digest(name: str) -> bytes:
+    with open(_json_file(name), "rb") as file:
+        return hashlib.sha256(file.read()).digest()[:16]
+
+"""
+One-time build step. Packs the JSON word lists next to the code into a single
+binary word file: for each list its name, the digest of its JSON file, the
+words as 5 bytes each and the letter position masks of WordIndex, so none of
+it has to be parsed or computed at startup. Run it again after editing a list
+"""
+def build_word_file(file_name: str = WORD_FILE, names: List[str] = WORD_LISTS) -> str:
+    with open(file_name, "wb") as outfile:
+        outfile.write(HEADER.pack(MAGIC, len(names)))
+        for name in names:
+            with open(_json_file(name)) as file:
+                word_list = json.load(file)
+
+            outfile.write(LIST_HEADER.pack(name.encode("ascii"), _json_digest(name), len(word_list)))
+            outfile.write("".join(word_list).encode("ascii"))
+            for position_masks in letter_position_masks(word_list):
+                for mask in position_masks:
+                    outfile.write(mask.to_bytes(_mask_bytes(len(word_list)), "little"))
+
+    return file_name
+
+"""
+Read the word file once. Returns the file's bytes and name -> (words, JSON
+digest, offset of the letter position masks) for every list in it
+"""
+@lru_cache(maxsize=None)
+def _read_word_file(file_name: str = WORD_FILE) -> tuple:
+    with open(file_name, "rb") as file:
+        data = file.read()
+
+    magic, num_lists = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(file_name + " is not a word file")
+
+    lists = {}
+    offset = HEADER.size
+    for _ in range(num_lists):
+        name, digest, count = LIST_HEADER.unpack_from(data, offset)
+        offset = offset + LIST_HEADER.size
+        letters = data[offset:offset + count * WORD_LENGTH].decode("ascii")
+        offset = offset + count * WORD_LENGTH
+        words = [letters[i:i + WORD_LENGTH] for i in range(0, len(letters), WORD_LENGTH)]
+        lists[name.rstrip(b"\0").decode("ascii")] = (words, digest, offset)
+        offset = offset + WORD_LENGTH * 26 * _mask_bytes(count)
+
+    return data, lists
+
+"""
+A word list by name, from the binary word file, or from its JSON file if the
+word file hasn't been built or the JSON file has been edited since. Loaded the
+first time it is asked for
+"""
+@lru_cache(maxsize=None)
+def load_words(name: str) -> List[str]:
+    if exists(WORD_FILE):
+        _, lists = _read_word_file()
+        if name in lists:
+            words, digest, _ = lists[name]
+            if not exists(_json_file(name)) or digest == _json_digest(name):
+                return words
+
+    with open(_json_file(name)) as file:
+        return json.load(file)
+
+def get_all_words() -> List[str]:
+    return load_words("all_words")
+
+def get_solution_words() -> List[str]:
+    return load_words("solution_words")
+
+"""
+The letter position masks stored for word_list in the word file, or None if it
+isn't one of the lists there
+"""
+def stored_letter_masks(word_list: List[str]) -> List[List[int]]:
+    if not exists(WORD_FILE):
+        return None
+
+    data, lists = _read_word_file()
+    for words, _, offset in lists.values():
+        if word_list is words or word_list == words:
+            size = _mask_bytes(len(words))
+            return [[int.from_bytes(data[offset + (j * 26 + letter) * size:offset + (j * 26 + letter + 1) * size], "little") for letter in range(26)] for j in range(WORD_LENGTH)]
+
+    return None
+
+"""
+all_words and solution_words are loaded when first used, not on import
+"""
+def __getattr__(name: str) -> List[str]:
+    if name in WORD_LISTS:
+        return load_words(name)
+    raise AttributeError("module " + __name__ + " has no attribute " + name)
+
+if __name__ == '__main__':
+    print(build_word_file())